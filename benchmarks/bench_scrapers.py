@@ -0,0 +1,335 @@
+"""
+Offline benchmark for the scrapers.
+
+Replays saved pages through a local stand-in server, so every static
+scraper runs its real fetch -> parse -> extract path without touching the
+network. Browser sites are replayed from their
+rendered page snapshot through the same extract spec; with --chrome (and a
+local Chrome) they are rendered in the browser pool instead. For each site
+it reports pages/sec, tenders/sec, latency percentiles per run and per page,
+and peak traced memory, and checks the tender counts against the
+expected.json next to the pages.
+
+There are two sets of pages. benchmarks/fixtures holds small hand-written
+pages, one or two listings per site, that pin down what each extract spec
+must find; they are kept for correctness and are too small to time. The
+timings are taken on benchmarks/recordings, real pages saved with `record`.
+Sites without a recording fall back to their fixtures, and are flagged in
+the results. --fixtures checks every site against its fixtures only.
+
+    python benchmarks/bench_scrapers.py [--iterations 20] [--sites GIZ,NIWE]
+                                        [--latency-ms 0] [--parser lxml]
+                                        [--chrome] [--fixtures]
+                                        [--json results.json]
+    python benchmarks/bench_scrapers.py record [SITE ...]
+
+`record` fetches the live pages of the named sites (all by default) and
+saves them under benchmarks/recordings. Links back to the site are
+rewritten to point at /<SITE>/ so that pagination stays on the stand-in
+server, and recordings/expected.json is updated with the tender counts of
+the new recordings.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+# Every iteration must hit the stand-in server, and a benchmark run should
+# leave no cache or report files behind.
+os.environ["HTTP_CACHE_DIR"] = ""
+os.environ["RUN_REPORT_FILE"] = ""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import scrape_tenders as st
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Hand-written correctness fixtures, and real pages saved by `record`
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, "fixtures")
+RECORDINGS_DIR = os.path.join(BENCHMARKS_DIR, "recordings")
+
+# --- Stand-in Server ---
+
+def fixture_name(query):
+    """File a page is recorded under: its query string, or index for the listing page itself."""
+    return (query or "index").replace("/", "_") + ".html"
+
+def pages_dir(name, roots):
+    """The first of `roots` holding pages for site `name`, or None."""
+    for root in roots:
+        if os.path.isdir(os.path.join(root, name)):
+            return root
+    return None
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves /<SITE>/...?<query> from <root>/<SITE>/<query>.html, after `latency` seconds."""
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, Nagle's algorithm
+    # and delayed ACKs add ~40 ms to every kept-alive request.
+    disable_nagle_algorithm = True
+    latency = 0.0
+    roots = (FIXTURES_DIR,)
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        parts = urlsplit(self.path)
+        site = parts.path.strip("/").split("/")[0]
+        root = pages_dir(site, self.roots)
+        path = os.path.join(root, site, fixture_name(parts.query)) if root else ""
+        if not os.path.isfile(path):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fixture_server(latency=0.0, roots=(FIXTURES_DIR,)):
+    """
+    Starts the stand-in server on a free local port and returns it with its
+    base URL. Each site is served from the first of `roots` that has it.
+    """
+    handler = type("LatencyFixtureHandler", (FixtureHandler,), {"latency": latency, "roots": tuple(roots)})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+# --- Benchmark ---
+
+def fetch_mode(website):
+    return website.get('fetch', 'browser' if website['dynamic'] else 'static')
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+def site_runner(website, base_url, root=FIXTURES_DIR, use_chrome=False):
+    """
+    Returns a callable scraping `website` from its pages under `root`, or
+    None if the site has none (or needs a browser that is not being used).
+    """
+    name = website['name']
+    if not os.path.isdir(os.path.join(root, name)):
+        return None
+    local = dict(website, url=f"{base_url}/{name}/")
+    mode = fetch_mode(website)
+    if mode == 'browser':
+        if use_chrome:
+            return lambda: st.get_browser_tenders(local)
+        with open(os.path.join(root, name, fixture_name("")), "rb") as f:
+            snapshot = f.read()
+        extractor = st.get_site_extractor(website)
+        return lambda: extractor.extract(st.make_soup(snapshot, name), website['url']) or []
+    if mode == 'custom' and website['dynamic']:
+        # GTAI and ADB click through their pages; a snapshot can't replay that.
+        return None
+    return lambda: st.get_all_tenders_for_website(local)
+
+def run_quietly(run):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run()
+
+def bench_site(name, run, iterations):
+    """Times `iterations` runs of a site's scraper and measures the peak memory of one more."""
+    run_quietly(run)  # warm-up: imports, compiled selectors, pooled connections
+
+    run_latencies, page_latencies = [], []
+    pages = tenders = 0
+    for _ in range(iterations):
+        st.RUN_METRICS = st.RunMetrics()
+        started = time.perf_counter()
+        result = run_quietly(run)
+        run_latencies.append(time.perf_counter() - started)
+        fetches = [r['seconds'] for r in st.RUN_METRICS.records if r['stage'] in ('fetch', 'render')]
+        # A replayed snapshot is one page that was never fetched.
+        pages += len(fetches) or 1
+        page_latencies.extend(fetches)
+        tenders += len(result)
+
+    tracemalloc.start()
+    try:
+        run_quietly(run)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    total = sum(run_latencies)
+    return {
+        'site': name,
+        'iterations': iterations,
+        'tenders': len(result),
+        'pages_per_sec': pages / total,
+        'tenders_per_sec': tenders / total,
+        'run_ms': {p: percentile(run_latencies, p) * 1000 for p in (50, 90, 99)},
+        'page_ms': {p: percentile(page_latencies, p) * 1000 for p in (50, 90, 99)},
+        'peak_kb': peak / 1024,
+    }
+
+def print_results(results, expected):
+    print(f"{'site':<10} {'pages':<9} {'tenders':>7} {'pages/s':>9} {'tenders/s':>10} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'page p50':>9} {'peak KB':>9}")
+    for r in results:
+        want = expected[r['pages']].get(r['site'], r['tenders'])
+        flag = '' if want == r['tenders'] else f"  (expected {want})"
+        print(f"{r['site']:<10} {r['pages']:<9} {r['tenders']:>7} {r['pages_per_sec']:>9.1f} {r['tenders_per_sec']:>10.1f} "
+              f"{r['run_ms'][50]:>8.2f} {r['run_ms'][90]:>8.2f} {r['run_ms'][99]:>8.2f} "
+              f"{r['page_ms'][50]:>9.2f} {r['peak_kb']:>9.1f}{flag}")
+
+def expected_file(root):
+    return os.path.join(root, "expected.json")
+
+def load_expected(root):
+    if not os.path.exists(expected_file(root)):
+        return {}
+    with open(expected_file(root), "r") as f:
+        return json.load(f)
+
+def benchmark(args):
+    if args.parser:
+        st.HTML_PARSER = args.parser
+    names = set(args.sites.split(",")) if args.sites else None
+    roots = (FIXTURES_DIR,) if args.fixtures else (RECORDINGS_DIR, FIXTURES_DIR)
+    server, base_url = start_fixture_server(args.latency_ms / 1000, roots)
+    results = []
+    try:
+        for website in st.WEBSITES:
+            if names and website['name'] not in names:
+                continue
+            root = pages_dir(website['name'], roots)
+            run = root and site_runner(website, base_url, root, args.chrome)
+            if not run:
+                print(f"Skipping {website['name']}: no replayable pages.")
+                continue
+            result = bench_site(website['name'], run, args.iterations)
+            result['pages'] = 'recorded' if root == RECORDINGS_DIR else 'fixtures'
+            results.append(result)
+    finally:
+        st.close_session()
+        st.BROWSER_POOL.close()
+        server.shutdown()
+
+    expected = {'recorded': load_expected(RECORDINGS_DIR), 'fixtures': load_expected(FIXTURES_DIR)}
+    print(f"Parser: {st.HTML_PARSER}, {args.iterations} iterations, {args.latency_ms} ms server latency")
+    print_results(results, expected)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    unrecorded = [r['site'] for r in results if r['pages'] == 'fixtures']
+    if unrecorded and not args.fixtures:
+        print(f"No recorded pages for: {', '.join(unrecorded)}. Their timings come from the "
+              f"hand-written fixtures and say little; run `record` to time them on real pages.")
+    mismatched = [r['site'] for r in results if expected[r['pages']].get(r['site'], r['tenders']) != r['tenders']]
+    if mismatched:
+        print(f"Tender counts differ from the expected counts for: {', '.join(mismatched)}")
+        return 1
+    return 0
+
+# --- Recording ---
+
+def localize_links(markup, website):
+    """Rewrites links back to the site so that they resolve to /<SITE>/ on the stand-in server."""
+    name = website['name'].encode()
+    origin = "{0.scheme}://{0.netloc}".format(urlsplit(website['url'])).encode()
+    markup = markup.replace(origin, b"/" + name)
+    return re.sub(rb'(href=["\'])/(?!/|' + re.escape(name) + rb'/)', rb'\g<1>/' + name + b'/', markup)
+
+def record_site(website):
+    """Fetches a site's live pages (or renders it, for browser sites) and saves them as recordings."""
+    pages = {}
+    if fetch_mode(website) == 'browser':
+        driver = st.new_chrome_driver()
+        try:
+            driver.get(website['url'])
+            st.WebDriverWait(driver, 30).until(
+                st.EC.presence_of_element_located((st.By.CSS_SELECTOR, website['wait_selector']))
+            )
+            pages[""] = driver.page_source.encode("utf-8")
+        finally:
+            driver.quit()
+    else:
+        original_get = st.http_get
+
+        def recording_get(url, **kwargs):
+            response = original_get(url, **kwargs)
+            pages[urlsplit(url).query] = response.content
+            return response
+
+        st.http_get = recording_get
+        try:
+            st.get_all_tenders_for_website(website)
+        finally:
+            st.http_get = original_get
+
+    site_dir = os.path.join(RECORDINGS_DIR, website['name'])
+    os.makedirs(site_dir, exist_ok=True)
+    for query, markup in pages.items():
+        if fetch_mode(website) != 'browser':
+            markup = localize_links(markup, website)
+        with open(os.path.join(site_dir, fixture_name(query)), "wb") as f:
+            f.write(markup)
+    print(f"Recorded {len(pages)} page(s) for {website['name']}.")
+    return bool(pages)
+
+def record(args):
+    expected = load_expected(RECORDINGS_DIR)
+    recorded = []
+    for website in st.WEBSITES:
+        if args.sites and website['name'] not in args.sites:
+            continue
+        if fetch_mode(website) == 'custom' and website['dynamic']:
+            print(f"Skipping {website['name']}: its scraper drives the browser through several pages.")
+            continue
+        try:
+            if record_site(website):
+                recorded.append(website)
+        except Exception as e:
+            print(f"An error occurred while recording {website['name']}: {e}")
+    st.close_session()
+
+    server, base_url = start_fixture_server(roots=(RECORDINGS_DIR,))
+    try:
+        for website in recorded:
+            run = site_runner(website, base_url, RECORDINGS_DIR)
+            expected[website['name']] = len(run_quietly(run))
+    finally:
+        st.close_session()
+        server.shutdown()
+    with open(expected_file(RECORDINGS_DIR), "w") as f:
+        json.dump(expected, f, indent=4)
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark over recorded pages.")
+    subcommands = parser.add_subparsers(dest="command")
+    recorder = subcommands.add_parser("record", help="record live pages for the timing runs")
+    recorder.add_argument("sites", nargs="*", help="sites to record (default: all)")
+    parser.add_argument("--iterations", type=int, default=20, help="timed runs per site")
+    parser.add_argument("--sites", help="comma-separated sites to benchmark (default: all with fixtures)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay the stand-in server adds per request")
+    parser.add_argument("--parser", help="BeautifulSoup parser to use instead of HTML_PARSER")
+    parser.add_argument("--chrome", action="store_true", help="render browser sites in Chrome instead of replaying snapshots")
+    parser.add_argument("--fixtures", action="store_true", help="use the hand-written fixtures even where recordings exist")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    return record(args) if args.command == "record" else benchmark(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
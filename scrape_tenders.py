@@ -1,21 +1,98 @@
-import requests
-from bs4 import BeautifulSoup
-import smtplib
-import os
-import json
-import re
-import warnings
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from urllib3.exceptions import InsecureRequestWarning
+import time
+from contextlib import contextmanager
+
+# How long each group of imports took, for the --profile-imports report.
+# Selenium, the SMTP and email modules and pypdf are imported by the code
+# that needs them (see load_selenium()), so runs that never open a browser,
+# send mail or read a PDF don't pay for them.
+IMPORT_TIMINGS = {}
+_module_started = time.perf_counter()
+
+@contextmanager
+def timed_import(name):
+    started = time.perf_counter()
+    yield
+    IMPORT_TIMINGS.setdefault(name, time.perf_counter() - started)
+
+with timed_import("requests"):
+    import requests
+    from urllib3.exceptions import InsecureRequestWarning
+with timed_import("beautifulsoup4, soupsieve"):
+    from bs4 import BeautifulSoup, SoupStrainer, Tag, Comment
+    import soupsieve as sv
+with timed_import("standard library"):
+    import os
+    import io
+    import argparse
+    import atexit
+    import json
+    import hashlib
+    import heapq
+    import csv
+    import random
+    import cProfile
+    import sqlite3
+    import unicodedata
+    import re
+    import shutil
+    import signal
+    import tempfile
+    import threading
+    import uuid
+    import warnings
+    from datetime import datetime, timedelta, timezone
+    from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+    from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 
 # --- Selenium imports ---
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
+# Bound by load_selenium() the first time a browser is launched.
+webdriver = By = WebDriverWait = EC = None
+TimeoutException = NoSuchElementException = ElementClickInterceptedException = WebDriverException = None
+_selenium_lock = threading.Lock()
+
+def load_selenium():
+    """
+    Imports Selenium into this module on first use. Every browser comes from
+    new_chrome_driver(), which calls this, so the Selenium names above are
+    bound before any code that drives a browser runs.
+    """
+    global webdriver, By, WebDriverWait, EC
+    global TimeoutException, NoSuchElementException, ElementClickInterceptedException, WebDriverException
+    with _selenium_lock:
+        if webdriver is not None:
+            return
+        with timed_import("selenium (lazy)"):
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.support import expected_conditions as EC
+            from selenium.common.exceptions import (
+                TimeoutException, NoSuchElementException, ElementClickInterceptedException, WebDriverException
+            )
+            from selenium import webdriver  # Bound last: marks Selenium as loaded
+
+# Prefer lxml for parsing when it is installed; it is several times faster
+# than the pure-Python html.parser on large portal pages.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Tender PDFs are only read for their details (see ENRICH_TENDERS) when
+# pypdf is installed. It is imported by load_pypdf() on first use.
+PdfReader = None
+_pypdf_missing = False
+
+def load_pypdf():
+    """Returns pypdf's PdfReader, importing it on first use, or None if pypdf isn't installed."""
+    global PdfReader, _pypdf_missing
+    if PdfReader is None and not _pypdf_missing:
+        try:
+            with timed_import("pypdf (lazy)"):
+                from pypdf import PdfReader
+        except ImportError:
+            _pypdf_missing = True
+    return PdfReader
 
 # Suppress the InsecureRequestWarning for websites with certificate issues
 warnings.simplefilter('ignore', InsecureRequestWarning)
@@ -28,323 +105,1217 @@ RECEIVER_EMAILS_STR = os.environ.get("RECEIVER_EMAIL", "")
 RECEIVER_EMAILS = [email.strip() for email in RECEIVER_EMAILS_STR.split(',') if email.strip()]
 APP_PASSWORD = os.environ.get("APP_PASSWORD")
 
+# Outgoing mail server. With SMTP_SSL the connection uses implicit TLS
+# (port 465); otherwise it is upgraded with STARTTLS when the server offers
+# it, and logging in is skipped without APP_PASSWORD, so a local stand-in
+# (e.g. `python -m aiosmtpd -n -l localhost:1025` with SMTP_SSL=0) can be
+# used for testing.
+SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "465"))
+SMTP_SSL = os.environ.get("SMTP_SSL", "1") != "0"
+SMTP_TIMEOUT_SECONDS = 30
+
+# Alerts are queued in OUTBOX_DIR, one JSON file each, before anything is
+# sent, and a queued alert is only removed once the server has accepted it.
+# Each run delivers the whole queue oldest first, OUTBOX_BATCH_SIZE messages
+# per SMTP connection, so alerts a run failed to send go out with the next
+# one. An alert still failing after OUTBOX_MAX_ATTEMPTS runs is moved to
+# OUTBOX_DIR/failed for a person to look at.
+OUTBOX_DIR = os.environ.get("OUTBOX_DIR", "outbox")
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 10
+
 # This line was likely missing in your modified file, causing the NameError.
 # It defines the filename for storing seen tenders.
 TENDERS_DATA_FILE = "all_tenders_data.json"
 
+# Seen tenders are kept in an indexed SQLite store. It is seeded from
+# TENDERS_DATA_FILE the first time it is created, and TENDERS_DATA_FILE is
+# re-exported from it at the end of each run (for the workflow's commit step)
+# unless EXPORT_TENDERS_JSON=0.
+TENDERS_DB_FILE = os.environ.get("TENDERS_DB_FILE", "tenders.db")
+EXPORT_TENDERS_JSON = os.environ.get("EXPORT_TENDERS_JSON", "1") != "0"
+
+# Paginated scrapers stop once INCREMENTAL_STOP_AFTER consecutive tenders are
+# already known, since new tenders are listed first. Every
+# FULL_CRAWL_INTERVAL_HOURS a site is crawled in full to catch closures.
+INCREMENTAL_STOP_AFTER = int(os.environ.get("INCREMENTAL_STOP_AFTER", "10"))
+FULL_CRAWL_INTERVAL_HOURS = int(os.environ.get("FULL_CRAWL_INTERVAL_HOURS", "168"))
+
+# Scraped tenders are merged into the store rather than replacing it, each
+# with the time it was first and last seen. A tender that drops off its
+# site's listing is kept (and so not reported again if it comes back) until
+# it has been missing from TENDER_RETENTION_RUNS full crawls in a row;
+# incremental and partial crawls never count as missing a tender.
+TENDER_RETENTION_RUNS = int(os.environ.get("TENDER_RETENTION_RUNS", "30"))
+
+# New tenders are enriched with the closing date, value, EMD and reference
+# number found in the page or document they link to, fetched by up to
+# ENRICH_WORKERS threads while the scrapers run. Documents are remembered in
+# the store by URL, so none is downloaded twice, and by content hash, so a
+# copy posted under another URL isn't parsed again. Documents larger than
+# ENRICH_MAX_BYTES are skipped, and only the first ENRICH_PDF_PAGES pages of
+# a PDF are read. Set ENRICH_TENDERS=0 to disable.
+ENRICH_TENDERS = os.environ.get("ENRICH_TENDERS", "1") != "0"
+ENRICH_WORKERS = 4
+ENRICH_MAX_BYTES = 10 * 1024 * 1024
+ENRICH_PDF_PAGES = 5
+
+# Static (non-dynamic) websites are scraped in parallel. MAX_WORKERS caps the
+# number of sites in flight at once and MAX_REQUESTS_PER_HOST caps how many of
+# them may hit the same host concurrently. Set SCRAPER_MAX_WORKERS=1 to scrape
+# sequentially.
+MAX_WORKERS = int(os.environ.get("SCRAPER_MAX_WORKERS", "8"))
+MAX_REQUESTS_PER_HOST = int(os.environ.get("SCRAPER_MAX_PER_HOST", "2"))
+
+# On-disk HTTP cache used for conditional GETs (ETag / Last-Modified) and to
+# detect unchanged pages by content hash. Set HTTP_CACHE_DIR="" to disable.
+HTTP_CACHE_DIR = os.environ.get("HTTP_CACHE_DIR", ".http_cache")
+
+# Sites whose page URLs are predictable (NIWE's ?page=N) have up to this many
+# pages fetched ahead in parallel, but never more than MAX_REQUESTS_PER_HOST.
+# Set PAGE_PREFETCH_WINDOW=1 to fetch pages one at a time.
+PAGE_PREFETCH_WINDOW = int(os.environ.get("PAGE_PREFETCH_WINDOW", "4"))
+
+# Requests that fail with a connection error, a timeout or a 429/5xx status
+# are retried up to MAX_RETRIES times with exponential backoff and full
+# jitter (up to RETRY_BASE_DELAY * 2**attempt seconds, capped at
+# RETRY_MAX_DELAY). A site may spend at most SITE_RETRY_BUDGET retries per
+# run across all of its pages, so a hung portal can't retry every page.
+# A site that fails CIRCUIT_FAILURE_THRESHOLD runs in a row is skipped until
+# CIRCUIT_COOLDOWN_HOURS have passed; the next run then probes it, closing
+# the circuit on success and reopening it on failure.
+MAX_RETRIES = int(os.environ.get("MAX_RETRIES", "3"))
+RETRY_BASE_DELAY = float(os.environ.get("RETRY_BASE_DELAY", "1"))
+RETRY_MAX_DELAY = float(os.environ.get("RETRY_MAX_DELAY", "30"))
+SITE_RETRY_BUDGET = int(os.environ.get("SITE_RETRY_BUDGET", "6"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_COOLDOWN_HOURS = float(os.environ.get("CIRCUIT_COOLDOWN_HOURS", "12"))
+
+# A run stops scraping RUN_DEADLINE_SECONDS after it started, and each site
+# gets at most SITE_TIME_BUDGET_SECONDS (or its "time_budget"). Requests and
+# browser waits are cut to the time left; a site that runs out has its
+# browser quit and the tenders found so far reported as partial results.
+# Sites still running DEADLINE_GRACE_SECONDS after the run deadline are
+# abandoned.
+RUN_DEADLINE_SECONDS = float(os.environ.get("RUN_DEADLINE_SECONDS", "1200"))
+SITE_TIME_BUDGET_SECONDS = float(os.environ.get("SITE_TIME_BUDGET_SECONDS", "300"))
+DEADLINE_GRACE_SECONDS = float(os.environ.get("DEADLINE_GRACE_SECONDS", "15"))
+
+# In daemon mode (`python scrape_tenders.py daemon`) the process stays up,
+# with its HTTP session, browsers and tender store kept warm, and checks each
+# site every "poll_interval" minutes (POLL_INTERVAL_MINUTES unless set).
+# Sites falling due within POLL_BATCH_SECONDS of each other are checked
+# together, as one run with its own deadline, report and alert email.
+POLL_INTERVAL_MINUTES = float(os.environ.get("POLL_INTERVAL_MINUTES", "1440"))
+POLL_BATCH_SECONDS = 60
+
+# Each run records per-site, per-page timings (fetch, parse, extract, diff,
+# store) and writes them to RUN_REPORT_FILE: JSON, or CSV if the name ends in
+# .csv. Set RUN_REPORT_FILE="" to disable. Sites named in PROFILE_SCRAPERS
+# (comma-separated, or "all") are scraped under PROFILER ("cprofile" or
+# "pyinstrument") and their profiles saved in PROFILE_DIR.
+RUN_REPORT_FILE = os.environ.get("RUN_REPORT_FILE", "run_report.json")
+PROFILE_SCRAPERS = {name.strip() for name in os.environ.get("PROFILE_SCRAPERS", "").split(",") if name.strip()}
+PROFILER = os.environ.get("PROFILER", "cprofile")
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+
+# Headless Chrome instances are shared by the Selenium scrapers. A browser is
+# relaunched after BROWSER_MAX_USES checkouts or as soon as it stops responding.
+# Dynamic sites run concurrently, one browser each. Unless BROWSER_POOL_SIZE is
+# set, the number of browsers is derived from the available memory, assuming
+# CHROME_MEMORY_MB per instance, and capped at MAX_BROWSERS.
+BROWSER_MAX_USES = int(os.environ.get("BROWSER_MAX_USES", "10"))
+MAX_BROWSERS = int(os.environ.get("MAX_BROWSERS", "3"))
+CHROME_MEMORY_MB = int(os.environ.get("CHROME_MEMORY_MB", "500"))
+
+def available_memory_mb():
+    """Returns the memory available for new processes in MB, or None if it can't be determined."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (IOError, ValueError, IndexError):
+        pass
+    return None
+
+def browser_concurrency_limit(max_browsers=MAX_BROWSERS, per_browser_mb=CHROME_MEMORY_MB):
+    """Returns how many headless Chrome instances fit in the available memory (at least one)."""
+    available = available_memory_mb()
+    if available is None:
+        return max_browsers
+    return max(1, min(max_browsers, available // per_browser_mb))
+
+BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE") or browser_concurrency_limit())
+
 # A list of all websites to track. Add or remove entries as needed.
+# Tenders are told apart by the keys built in tender_key(): "ref_pattern" is a
+# regex for the site's tender reference number (searched in the title, then
+# the URL), and "key_by": "url" identifies tenders by their canonical URL
+# instead of their normalized title.
+#
+# How a site is scraped is described by its entry rather than by a function:
+#   "fetch"       "static" (default for non-dynamic sites, plain HTTP),
+#                 "browser" (default for dynamic sites, rendered in Chrome
+#                 once "wait_selector" appears) or "custom" (a hand-written
+#                 scraper registered in CUSTOM_SCRAPERS).
+#   "parse_only"  SoupStrainer arguments limiting parsing to the subtrees the
+#                 spec reads (see make_soup()).
+#   "extract"     Where the tenders are on the page, compiled once by
+#                 SiteExtractor:
+#       "listing"     CSS selector of the element holding the tenders, or
+#                     {"selector", "has": {"selector", "text_pattern"}} for
+#                     the first such element containing a matching child.
+#       "rows"        CSS selector of one tender within the listing.
+#       "skip_rows"   Leading rows to ignore (table headers).
+#       "min_cells"   Rows with fewer <td> cells are ignored.
+#       "title", "link"  Locators: {"cell": i} (a <td> of the row),
+#                     {"cells": [i, j]} (the first of them with text),
+#                     {"from_cell": i} (the first of cells i.. with a match),
+#                     narrowed by "selector", "text" and "text_pattern". The
+#                     title defaults to the link's text.
+#       "url"         "page" to use the listing URL for every tender.
+#       "join"        How hrefs become URLs: "urljoin" (default), "prefix"
+#                     (base_url + href unless absolute) or "none".
+#       "base_url"    Base for "join" (defaults to the site URL).
+#       "default_href", "default_title"  Used when the locator finds nothing.
+#       "title_pattern"  Only keep tenders whose title matches.
+#       "skip_url_titles"  Drop links whose text is just their URL.
+#   "pagination"  {"type": "next_link", "selector", "text_pattern"} follows a
+#                 "Next" link; {"type": "page_param", "param", "links"} reads
+#                 the last page number from the pagination links and fetches
+#                 the ?param=N pages ahead with crawl_numbered_pages().
+#   "retry_budget"  Overrides SITE_RETRY_BUDGET for the site.
+#   "time_budget"   Overrides SITE_TIME_BUDGET_SECONDS for the site.
+#   "poll_interval" Minutes between checks in daemon mode (overrides
+#                   POLL_INTERVAL_MINUTES).
 WEBSITES = [
     {
         "name": "GIZ",
         "url": "https://www.giz.de/en/live-tenders-giz-india#live-tenders",
-        "dynamic": False
+        "dynamic": False,
+        "poll_interval": 360,
+        "ref_pattern": r"RFQ Nr\.?\s*\d+",
+        "extract": {
+            "listing": 'h2:-soup-contains-own("Live Tenders") ~ ul',
+            "rows": "li",
+            "link": {"selector": "a"},
+            "join": "none"
+        }
     },
     {
         "name": "GEDA",
         "url": "https://geda.gujarat.gov.in/geda/2018/5/30/Live%20Tenders/6207",
-        "dynamic": False
+        "dynamic": False,
+        "parse_only": {"name": "div", "attrs": {"class": "content-block"}},
+        "extract": {
+            "listing": "div.content-block",
+            "rows": "p",
+            "link": {"selector": "a"},
+            "join": "prefix",
+            "base_url": "https://geda.gujarat.gov.in"
+        }
     },
     {
         "name": "MAHAURJA",
         "url": "https://www.mahaurja.com/meda/en/tender",
-        "dynamic": False
+        "dynamic": False,
+        "ref_pattern": r"\d{4}_MEDA_\d+(?:_\d+)?",
+        "parse_only": {"name": ["table", "a"]},
+        "extract": {
+            "listing": "table:has(th.text-align-justify)",
+            "rows": "tr",
+            "title": {"selector": "th.text-align-justify"},
+            "link": {"selector": 'a[href$=".pdf" i]'},
+            "base_url": "https://www.mahaurja.com"
+        },
+        "pagination": {"type": "next_link", "selector": "a", "text_pattern": "Next"}
     },
     {
         "name": "HPPCL",
         "url": "https://hppcl.in/content/650_1_tender.aspx",
-        "dynamic": False
+        "dynamic": False,
+        "verify_ssl": False,
+        "parse_only": {"name": "table", "attrs": {"id": "cphmain_grdTenders"}},
+        "extract": {
+            "listing": "table#cphmain_grdTenders",
+            "rows": "tr",
+            "min_cells": 3,
+            "title": {"cell": 2, "strip": "outer"},
+            "url": "page"
+        }
     },
     {
         "name": "HAREDA",
         "url": "https://hareda.gov.in/tenders/",
-        "dynamic": False
+        "dynamic": False,
+        "parse_only": {"name": "table"},
+        "extract": {
+            "listing": {"selector": "table", "has": {"selector": "th", "text_pattern": "Title"}},
+            "rows": "tr",
+            "skip_rows": 1,
+            "min_cells": 2,
+            "title": {"cells": [0, 1]},
+            "link": {"selector": "a[href]"},
+            "default_href": "#",
+            "join": "prefix",
+            "base_url": "https://hareda.gov.in"
+        }
     },
     {
         "name": "BREDA",
         "url": "https://breda.co.in/livetender.aspx",
-        "dynamic": False
+        "dynamic": False,
+        "verify_ssl": False,
+        "parse_only": {"name": "table", "attrs": {"id": "ContentPlaceHolder1_GridView1"}},
+        "extract": {
+            "listing": "table#ContentPlaceHolder1_GridView1",
+            "rows": "tr",
+            "skip_rows": 1,
+            "min_cells": 3,
+            "title": {"cell": 2},
+            "link": {"from_cell": 2, "selector": 'a[href$=".pdf" i]'},
+            "default_href": "#",
+            "join": "prefix",
+            "base_url": "https://breda.co.in/"
+        }
     },
     {
         "name": "TGREDCO",
         "url": "https://tgredco.telangana.gov.in/Default.aspx",
-        "dynamic": False
+        "dynamic": False,
+        "key_by": "url",
+        "fetch": "custom",
+        "parse_only": {"name": "div", "attrs": {"id": "tenders"}}
     },
     {
         "name": "SECI",
         "url": "https://www.seci.co.in/tenders",
-        "dynamic": False
+        "dynamic": False,
+        "poll_interval": 30,
+        "parse_only": {"name": "table", "attrs": {"id": "tender-list"}},
+        "extract": {
+            "listing": "table#tender-list",
+            "rows": "tr",
+            "skip_rows": 1,
+            "min_cells": 5,
+            "title": {"cell": 4},
+            "link": {"cell": -1, "selector": "a"}
+        }
     },
     {
         "name": "NIWE",
         "url": "https://niwe.res.in/Tenders/tender_data/",
-        "dynamic": False
+        "dynamic": False,
+        "verify_ssl": False,
+        "parse_only": {"name": ["table", "ul"], "attrs": {"class": ["tender-table", "pagination-list"]}},
+        "extract": {
+            "listing": "table.tender-table",
+            "rows": "tr",
+            "skip_rows": 1,
+            "min_cells": 5,
+            "title": {"cell": 1},
+            "link": {"cell": 4, "selector": "a"}
+        },
+        "pagination": {"type": "page_param", "param": "page", "links": "ul.pagination-list a"}
     },
     {
         "name": "IREDA",
         "url": "https://www.ireda.in/tender",
-        "dynamic": False
+        "dynamic": False,
+        "parse_only": {"name": "table"},
+        "extract": {
+            "listing": {"selector": "table", "has": {"selector": "th", "text_pattern": "Title"}},
+            "rows": "tr",
+            "skip_rows": 1,
+            "min_cells": 3,
+            "title": {"cell": 1},
+            "link": {"cell": 2, "selector": "a"}
+        }
     },
     {
         "name": "NISE",
         "url": "https://nise.res.in/notices/",
-        "dynamic": False
+        "dynamic": False,
+        "verify_ssl": False,
+        "parse_only": {"name": "table", "attrs": {"id": "exampleTender"}},
+        "extract": {
+            "listing": "table#exampleTender",
+            "rows": "tbody tr",
+            "min_cells": 3,
+            "link": {"cell": 2, "selector": "a"},
+            "title_pattern": r"tender|eoi|rfp|bid|quotation|proposal|corrigendum"
+        }
     },
     {
         "name": "ADB",
         "url": "https://www.adb.org/projects/tenders/country/india/sector/energy-1059",
         "dynamic": True,
+        "fetch": "custom",
         "wait_selector": "div.item.linked",
-        "title_selector": "div.item-title",
-        "link_selector": "a"
+        "parse_only": {"name": "div", "attrs": {"class": "item linked"}},
+        "extract": {
+            "rows": "div.item.linked",
+            "title": {"selector": "div.item-title"},
+            "link": {"selector": "a"}
+        }
     },
     {
         "name": "GTAI",
         "url": "https://www.gtai.de/en/meta/search/66080!search;eNqVkUFOw0AMRe_idZCARaXmAFwAdoiF47hlqokd7JlCqHp3JiBYgEBm5xk9-_t_n2CHxMWhP8FQPQm7X6Axrh_OmanwCP39Qwf8QvmjIjlADygLnDuwOliibzhst5vNNfzeRVql2BJW8YaoeZjP-ByfPTMlzGGeSUWnH57_MFu96BRffpcEhdjCDfMjOsfX0Wlu5U07wYglqcSdH1nK3TLzP-5miePOvQ6HRsWTUpuwROevSeGeb9NrM3B12cET9FJzbrpqTRSc1Bg6aLG8W2QZPwlD2fMXXnDl18f5_Ab6yBAMM?facets%5Bcountry%5D.tf=3120",
         "dynamic": True,
+        "fetch": "custom",
         "wait_selector": "li.result-item",
-        "title_selector": "div.content > a",
-        "link_selector": "a"
+        "parse_only": {"name": "li", "attrs": {"class": "result-item"}},
+        "extract": {
+            "rows": "li.result-item",
+            "title": {"selector": "div.content > a"},
+            "link": {"selector": "a"}
+        }
     },
     {
         "name": "RRECL",
         "url": "https://energy.rajasthan.gov.in/rrecl/#/pages/sm/tender-list/49147/197/0",
         "dynamic": True,
         "wait_selector": "a.tender-link",
-        "title_selector": "a.tender-link",
-        "link_selector": "a.tender-link"
+        "extract": {
+            "rows": "a.tender-link",
+            "link": {"selector": "a.tender-link"},
+            "skip_url_titles": True
+        }
     },
     # --- New Website Entry for MAHAPREIT ---
     {
         "name": "MAHAPREIT",
         "url": "https://mahapreit.in/page/tender",
-        "dynamic": False
+        "dynamic": False,
+        "parse_only": {"name": "div", "attrs": {"class": ["post-item", "pagination"]}},
+        "extract": {
+            "rows": "div.post-item",
+            "title": {"selector": "h3 a"},
+            "default_title": "No Title Found",
+            "link": {"selector": "a", "text": "Download"}
+        },
+        "pagination": {"type": "next_link", "selector": "div.pagination a", "text_pattern": "Next"}
     }
 ]
 
-# --- Scraping Functions (BeautifulSoup) ---
+# JSON/XHR endpoints recorded for dynamic sites by `python scrape_tenders.py
+# discover-api <SITE>...`. When a site has an entry here it is fetched over
+# plain HTTP, and the browser is only used if the API response no longer has
+# the recorded shape.
+SITE_API_FILE = "site_api_endpoints.json"
+API_MAX_PAGES = 20
 
-def get_giz_tenders(url):
-    """Scrapes the GIZ tenders page for all tender details."""
-    tender_list = []
+def load_site_api_endpoints(filename=SITE_API_FILE):
+    """Loads the recorded API endpoints, keyed by website name."""
+    if not os.path.exists(filename) or os.stat(filename).st_size == 0:
+        return {}
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching the GIZ URL: {e}")
-        return []
-    
-    soup = BeautifulSoup(response.content, 'html.parser')
-    tender_list_element = soup.find('h2', string='Live Tenders').find_next_sibling('ul')
-    if tender_list_element:
-        tender_items = tender_list_element.find_all('li')
-        for item in tender_items:
-            link = item.find('a')
-            if link:
-                tender_list.append({
-                    'title': link.get_text(strip=True),
-                    'url': link.get('href')
-                })
-    return tender_list
+        with open(filename, "r") as f:
+            return json.load(f)
+    except (IOError, json.JSONDecodeError) as e:
+        print(f"Error loading API endpoints from file '{filename}': {e}")
+        return {}
 
-def get_geda_tenders(url):
-    """Scrapes the GEDA tenders page for all tender details."""
-    tender_list = []
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching the GEDA URL: {e}")
-        return []
+SITE_API_ENDPOINTS = load_site_api_endpoints()
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-    content_block = soup.find('div', class_='content-block')
-    if content_block:
-        tender_paragraphs = content_block.find_all('p')
-        for p in tender_paragraphs:
-            link = p.find('a')
-            if link and link.get('href'):
-                href = link.get('href')
-                base_url = "https://geda.gujarat.gov.in"
-                full_url = href if href.startswith(('http://', 'https://')) else f"{base_url}{href}"
-                tender_list.append({
-                    'title': link.get_text(strip=True),
-                    'url': full_url
-                })
-    return tender_list
+# --- Run Instrumentation ---
 
-def get_mahaurja_tenders(url):
+class RunMetrics:
     """
-    Scrapes the MahaUrja tenders page, including all paginated pages,
-    and returns a complete list of tender details.
+    Thread-safe collector for the stage timings recorded with timed(). Each
+    record is one stage of one site (one page, for fetches) with its duration
+    in seconds and any fields the stage added, such as the URL, byte count or
+    HTTP status.
     """
-    tender_list = []
-    page_url = url
-    while page_url:
-        print(f"Scraping page: {page_url}")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = []
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+
+    def record(self, stage, seconds, site=None, **fields):
+        entry = {'site': site, 'stage': stage, 'seconds': round(seconds, 6), **fields}
+        with self.lock:
+            self.records.append(entry)
+
+    def summary(self):
+        """Totals per site and stage: {site: {stage: {'count', 'seconds', 'bytes'}}}."""
+        with self.lock:
+            records = list(self.records)
+        sites = {}
+        for entry in records:
+            stages = sites.setdefault(entry['site'] or 'run', {})
+            totals = stages.setdefault(entry['stage'], {'count': 0, 'seconds': 0.0, 'bytes': 0})
+            totals['count'] += 1
+            totals['seconds'] = round(totals['seconds'] + entry['seconds'], 6)
+            totals['bytes'] += entry.get('bytes') or 0
+        return sites
+
+    def print_summary(self, limit=5):
+        """Prints the sites that took longest to scrape."""
+        scraped = [(stages['scrape']['seconds'], site) for site, stages in self.summary().items() if 'scrape' in stages]
+        print(f"Run took {time.perf_counter() - self.started:.1f}s. Slowest sites:")
+        for seconds, site in sorted(scraped, reverse=True)[:limit]:
+            print(f"  {site}: {seconds:.2f}s")
+
+    def write_report(self, filename):
+        """Writes every record (CSV) or the records plus per-site totals (JSON) to `filename`."""
+        with self.lock:
+            records = list(self.records)
         try:
-            response = requests.get(page_url, timeout=10)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            print(f"Error during page scrape: {e}")
-            break
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        first_title_tag = soup.find('th', class_='text-align-justify')
+            if filename.endswith('.csv'):
+                columns = ['site', 'stage', 'seconds']
+                for entry in records:
+                    columns.extend(key for key in entry if key not in columns)
+                with open(filename, "w", newline="") as f:
+                    writer = csv.DictWriter(f, fieldnames=columns)
+                    writer.writeheader()
+                    writer.writerows(records)
+            else:
+                report = {
+                    'started_at': self.started_at.isoformat(),
+                    'seconds': round(time.perf_counter() - self.started, 6),
+                    'sites': self.summary(),
+                    'records': records,
+                }
+                with open(filename, "w") as f:
+                    json.dump(report, f, indent=2)
+            print(f"Run report written to {filename}.")
+        except IOError as e:
+            print(f"Error writing run report '{filename}': {e}")
+
+RUN_METRICS = RunMetrics()
+
+def current_site():
+    """Name of the website this thread is scraping (see scrape_website), if any."""
+    return getattr(_fetch_context, 'site', None)
+
+def mark_crawl_incomplete():
+    """
+    Records that the crawl of the website this thread is scraping stopped on
+    an error before its last page, so its tenders are stored as a partial
+    crawl (see scrape_website).
+    """
+    _fetch_context.incomplete = True
 
-        if not first_title_tag:
-            print("Could not find any tender title elements on the page.")
-            break
+@contextmanager
+def timed(stage, site=None, **fields):
+    """
+    Records how long the enclosed block took as `stage` of `site` (by default
+    the site this thread is scraping). The yielded dict may be filled with
+    extra fields once they are known; an exception is recorded by type.
+    """
+    started = time.perf_counter()
+    try:
+        yield fields
+    except BaseException as e:
+        fields['error'] = type(e).__name__
+        raise
+    finally:
+        RUN_METRICS.record(stage, time.perf_counter() - started, site or current_site(), **fields)
 
-        main_table = first_title_tag.find_parent('table')
-        if main_table:
-            for row in main_table.find_all('tr'):
-                try:
-                    title_tag = row.find('th', class_='text-align-justify')
-                    link_tag = row.find('a', href=re.compile(r'\.pdf$', re.IGNORECASE))
-                    if title_tag and link_tag and link_tag.get('href'):
-                        title = title_tag.get_text(strip=True)
-                        href = link_tag.get('href')
-                        base_url = "https://www.mahaurja.com"
-                        full_url = requests.compat.urljoin(base_url, href)
-                        tender_list.append({
-                            'title': title,
-                            'url': full_url
-                        })
-                except (AttributeError, IndexError):
-                    continue
+@contextmanager
+def profiled(site):
+    """Runs the enclosed block under PROFILER when `site` is listed in PROFILE_SCRAPERS."""
+    if not PROFILE_SCRAPERS & {site, 'all'}:
+        yield
+        return
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    if PROFILER == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("pyinstrument is not installed, profiling with cProfile instead.")
         else:
-            print("Could not find the main tender table on the page.")
-            break
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(os.path.join(PROFILE_DIR, f"{site}.html"), "w") as f:
+                    f.write(profiler.output_html())
+            return
+    # cProfile only sees this thread: prefetched pages are timed, not profiled.
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Only one cProfile may be active at a time on newer Pythons.
+        print(f"Could not profile {site}: {e}")
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(PROFILE_DIR, f"{site}.prof"))
 
-        next_link = soup.find('a', string=re.compile('Next', re.IGNORECASE))
-        if next_link and next_link.get('href'):
-            page_url = requests.compat.urljoin(url, next_link.get('href'))
-        else:
-            page_url = None
-            print("Pagination complete. No more pages to scrape.")
-    
-    return tender_list
+def print_import_report():
+    """
+    Prints how long each group of imports took, including the lazy ones
+    loaded so far (see --profile-imports). `python -X importtime` gives the
+    per-module breakdown.
+    """
+    print("Import times:")
+    for name, seconds in sorted(IMPORT_TIMINGS.items(), key=lambda item: -item[1]):
+        print(f"  {name:<28} {seconds * 1000:8.1f} ms")
+    print(f"  {'module load (total)':<28} {MODULE_LOAD_SECONDS * 1000:8.1f} ms")
 
-def get_hppcl_tenders(url):
-    """Fetches the HPPCL webpage and extracts all tenders."""
-    tender_list = []
+# --- Time Budgets ---
+
+class BudgetExceeded(requests.exceptions.Timeout):
+    """Raised when a site's time budget or the run deadline has run out."""
+
+class Deadline:
+    """A point in time, on the monotonic clock, by which a site or the whole run must finish."""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+        self.exceeded = False
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self, what="Time budget"):
+        """Raises BudgetExceeded (and remembers it) once the deadline has passed."""
+        if self.expired():
+            self.exceeded = True
+            raise BudgetExceeded(f"{what} exhausted")
+
+def current_deadline():
+    """Deadline of the website this thread is scraping (see scrape_website), if any."""
+    return getattr(_fetch_context, 'deadline', None)
+
+def browser_wait(driver, seconds):
+    """A WebDriverWait for up to `seconds`, cut to the time left in the site's budget."""
+    deadline = current_deadline()
+    if deadline:
+        seconds = min(seconds, deadline.remaining())
+    return WebDriverWait(driver, seconds)
+
+# --- Retries ---
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+class RetryBudget:
+    """The retries a site has left in this run, shared by all of its pages and threads."""
+
+    def __init__(self, retries=SITE_RETRY_BUDGET):
+        self.lock = threading.Lock()
+        self.remaining = retries
+
+    def take(self):
+        """Uses up one retry; returns False once the budget is spent."""
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+def current_retry_budget():
+    """Retry budget of the website this thread is scraping (see scrape_website), if any."""
+    return getattr(_fetch_context, 'retry_budget', None)
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY):
+    """Exponential backoff with full jitter: a random delay of up to base * 2**attempt seconds."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def with_retries(action, retryable=RETRYABLE_ERRORS, max_retries=MAX_RETRIES, budget=None, description="Request"):
+    """
+    Calls `action()`, retrying it after a backoff delay when it raises one
+    of `retryable`, up to `max_retries` times and while the site's retry
+    budget lasts. The last error is re-raised.
+    """
+    budget = budget or current_retry_budget()
+    attempt = 0
+    while True:
+        try:
+            return action()
+        except retryable as e:
+            if attempt >= max_retries or isinstance(e, BudgetExceeded):
+                raise
+            if budget and not budget.take():
+                print(f"{description} failed ({e}) and the site's retry budget is spent.")
+                raise
+            delay = backoff_delay(attempt)
+            deadline = current_deadline()
+            if deadline and delay >= deadline.remaining():
+                deadline.exceeded = True
+                raise BudgetExceeded(f"No time left to retry: {e}") from e
+            print(f"{description} failed ({e}). Retrying in {delay:.1f}s... (Attempt {attempt + 1}/{max_retries})")
+            time.sleep(delay)
+            attempt += 1
+
+# --- HTTP Session ---
+
+# All static scrapers share one pooled session so that connections (and TLS
+# handshakes) are reused across pages and sites on the same host.
+REQUEST_TIMEOUT = 10
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Hosts whose certificates can't be verified (see "verify_ssl" in WEBSITES).
+TLS_VERIFY_BY_HOST = {
+    urlparse(website['url']).netloc.lower(): website.get('verify_ssl', True)
+    for website in WEBSITES
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Returns the shared HTTP session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=len(TLS_VERIFY_BY_HOST),
+                pool_maxsize=max(MAX_WORKERS, MAX_REQUESTS_PER_HOST)
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+def close_session():
+    """Closes the shared HTTP session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def http_get(url, **kwargs):
+    """
+    Performs a GET through the shared session, applying the site's TLS policy
+    and the default timeout. Requests are made conditional on the validators
+    stored in the HTTP cache; a 304 is answered with the cached body so the
+    scrapers always see a complete page. The response carries a `not_modified`
+    flag that is set on a 304 or when the body hash matches the cached one.
+    Connection errors, timeouts and 429/5xx responses are retried with
+    backoff (see with_retries); a 429/5xx that persists raises HTTPError.
+    Once the site's time budget is spent, BudgetExceeded (a Timeout) is
+    raised instead of sending the request.
+    """
+    kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+    kwargs.setdefault('verify', TLS_VERIFY_BY_HOST.get(urlparse(url).netloc.lower(), True))
+
+    # A request may not outlive the site's time budget.
+    deadline = current_deadline()
+    if deadline:
+        deadline.check(f"{current_site() or 'Site'} time budget")
+        if isinstance(kwargs['timeout'], (int, float)):
+            kwargs['timeout'] = min(kwargs['timeout'], deadline.remaining())
+
+    # Only the first fetch of a site run (its listing page) may short-circuit it.
+    short_circuit = getattr(_fetch_context, 'short_circuit', False)
+    _fetch_context.short_circuit = False
+
+    cached = get_cached_validators(url)
+    if cached:
+        headers = dict(kwargs.pop('headers', None) or {})
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        kwargs['headers'] = headers
+
+    def send():
+        with timed('fetch', url=url) as fetch:
+            response = get_session().get(url, **kwargs)
+            # `elapsed` runs until the headers arrived (DNS, connect, TLS and
+            # server time); the rest of `seconds` is the body download.
+            fetch.update(status=response.status_code, bytes=len(response.content),
+                         elapsed=response.elapsed.total_seconds())
+            response.not_modified = False
+            if cached and response.status_code == 304:
+                body = read_cached_body(cached)
+                if body is not None:
+                    response._content = body
+                    response.not_modified = True
+            elif cached and response.ok and hashlib.sha256(response.content).hexdigest() == cached['sha256']:
+                response.not_modified = True
+            fetch['not_modified'] = response.not_modified
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            raise requests.exceptions.HTTPError(f"{response.status_code} Server Error for url: {url}", response=response)
+        return response
+
+    # Retryable statuses surface as HTTPError, as raise_for_status() would.
+    response = with_retries(send, RETRYABLE_ERRORS + (requests.exceptions.HTTPError,), description=f"GET {url}")
+
+    if response.ok and response.status_code != 304:
+        store_cached_response(url, response)
+
+    if short_circuit and response.not_modified:
+        raise PageNotModified(url)
+    return response
+
+# --- HTTP Cache ---
+
+class PageNotModified(Exception):
+    """Raised when a site's listing page is unchanged since the last run."""
+
+# Per-thread flag telling http_get whether the next fetch may short-circuit.
+_fetch_context = threading.local()
+
+def listing_fingerprint(listing):
+    """
+    Hashes the structure of a site's tender listing: its tags, links and
+    text, leaving out comments and attributes such as classes, ids and
+    inline styles, which portals change without the tenders changing.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for node in listing.descendants:
+        if isinstance(node, Tag):
+            digest.update(f"<{node.name} {node.get('href') or ''}>".encode('utf-8'))
+        elif not isinstance(node, Comment):
+            text = node.strip()
+            if text:
+                digest.update(text.encode('utf-8') + b"\0")
+    return digest.hexdigest()
+
+def check_listing_fingerprint(listing):
+    """
+    Fingerprints the first listing extracted in a site run (see
+    scrape_website) and raises PageNotModified if it matches the last run's,
+    so the tenders aren't extracted, diffed or stored again. Pages whose
+    banners or timestamps change, or whose server sends no validators, are
+    caught here rather than by the HTTP cache.
+    """
+    tracked = getattr(_fetch_context, 'listing', None)
+    if tracked is None or tracked['current'] is not None:
+        return
+    with timed('fingerprint'):
+        tracked['current'] = listing_fingerprint(listing)
+    if tracked['current'] == tracked['previous']:
+        raise PageNotModified(f"{current_site()} listing")
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+# Responses fetched this run, by site, until commit_http_cache() keeps them.
+_pending_http_cache = {}
+
+def _http_cache_index():
+    """Loads the HTTP cache index (URL -> validators) on first use."""
+    global _http_cache
+    if _http_cache is None:
+        _http_cache = {}
+        index_file = os.path.join(HTTP_CACHE_DIR, "index.json")
+        if HTTP_CACHE_DIR and os.path.exists(index_file):
+            try:
+                with open(index_file, "r") as f:
+                    _http_cache = json.load(f)
+            except (IOError, json.JSONDecodeError) as e:
+                print(f"Error loading HTTP cache index '{index_file}': {e}")
+    return _http_cache
+
+def get_cached_validators(url):
+    """Returns the stored ETag, Last-Modified and content hash for a URL, if any."""
+    if not HTTP_CACHE_DIR:
+        return None
+    with _http_cache_lock:
+        entry = _http_cache_index().get(url)
+    if entry and os.path.exists(os.path.join(HTTP_CACHE_DIR, f"{entry['sha256']}.html")):
+        return entry
+    return None
+
+def read_cached_body(entry):
+    """Reads the cached body for a cache entry, or None if it is missing."""
     try:
-        response = requests.get(url, verify=False, timeout=10)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching the HPPCL URL: {e}")
-        return []
-    
-    soup = BeautifulSoup(response.content, 'html.parser')
-    tenders_table = soup.find('table', {'id': 'cphmain_grdTenders'})
-    if tenders_table:
-        for row in tenders_table.find_all('tr'):
-            cells = row.find_all('td')
-            if len(cells) > 2:
+        with open(os.path.join(HTTP_CACHE_DIR, f"{entry['sha256']}.html"), "rb") as f:
+            return f.read()
+    except IOError:
+        return None
+
+def store_cached_response(url, response):
+    """
+    Records the validators and body of a fresh 200 response for the site
+    being scraped. They only enter the cache once the site's tenders have
+    been stored (see commit_http_cache), so a page whose scrape failed or
+    was cut short is never answered as "not modified" by a later run.
+    """
+    if not HTTP_CACHE_DIR:
+        return
+    entry = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'sha256': hashlib.sha256(response.content).hexdigest()
+    }
+    with _http_cache_lock:
+        _pending_http_cache.setdefault(current_site(), {})[url] = (entry, response.content)
+
+def commit_http_cache(website_names):
+    """Adds the responses fetched for the named sites this run to the cache index, writing their bodies."""
+    if not HTTP_CACHE_DIR:
+        return
+    with _http_cache_lock:
+        pending = [_pending_http_cache.pop(name, {}) for name in website_names]
+        index = _http_cache_index()
+        for responses in pending:
+            for url, (entry, body) in responses.items():
+                body_file = os.path.join(HTTP_CACHE_DIR, f"{entry['sha256']}.html")
                 try:
-                    title = cells[2].text.strip()
-                    tender_list.append({'title': title, 'url': url})
-                except IndexError:
+                    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+                    if not os.path.exists(body_file):
+                        with open(body_file, "wb") as f:
+                            f.write(body)
+                except IOError as e:
+                    print(f"Error writing HTTP cache entry for '{url}': {e}")
                     continue
-    return tender_list
+                index[url] = entry
 
-def get_hareda_tenders(url):
+def save_http_cache():
     """
-    Scrapes the HAREDA tenders page for all tender details.
+    Writes the HTTP cache index to disk and removes bodies no longer referenced.
+    Called once at the end of a run, after the tender data has been saved, so
+    a crashed run never leaves validators for pages that were not processed.
+    Responses of sites not committed this run are dropped.
     """
-    tender_list = []
-    try:
-        response = requests.get(url, timeout=10)
+    if not HTTP_CACHE_DIR:
+        return
+    with _http_cache_lock:
+        _pending_http_cache.clear()
+        if _http_cache is None:
+            return
+        try:
+            os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+            with open(os.path.join(HTTP_CACHE_DIR, "index.json"), "w") as f:
+                json.dump(_http_cache, f, indent=4)
+            referenced = {f"{entry['sha256']}.html" for entry in _http_cache.values()}
+            for name in os.listdir(HTTP_CACHE_DIR):
+                if name.endswith(".html") and name not in referenced:
+                    os.remove(os.path.join(HTTP_CACHE_DIR, name))
+        except IOError as e:
+            print(f"Error saving HTTP cache to '{HTTP_CACHE_DIR}': {e}")
+
+# --- HTML Parsing ---
+
+# The parts of each site's pages that its scraper actually reads (tender
+# tables, listing blocks and pagination links), from the "parse_only" entries
+# in WEBSITES. Only these subtrees are built; sites without an entry are
+# parsed in full.
+PARSE_ONLY = {website['name']: SoupStrainer(**website['parse_only']) for website in WEBSITES if 'parse_only' in website}
+
+def make_soup(markup, site=None):
+    """Parses markup with HTML_PARSER, restricted to the site's PARSE_ONLY subtrees."""
+    with timed('parse', site, bytes=len(markup)):
+        return BeautifulSoup(markup, HTML_PARSER, parse_only=PARSE_ONLY.get(site))
+
+# --- Paginated Crawling ---
+
+def crawl_numbered_pages(page_url, parse_page, stop=None, window=PAGE_PREFETCH_WINDOW, first_page=1):
+    """
+    Crawls a listing whose page URLs are predictable, yielding its tenders
+    page by page. `page_url(n)` builds the URL of page n and
+    `parse_page(response, n)` returns that page's tenders along with the
+    highest page number known so far.
+
+    The first page is fetched in the calling thread (it is the listing page the
+    HTTP cache may short-circuit on). After that up to `window` of the known
+    pages, and no more than MAX_REQUESTS_PER_HOST since they all share one
+    host, are fetched ahead in parallel while pages are parsed strictly in
+    order, so results come out exactly as a sequential crawl would return
+    them. Crawling ends at a page without tenders, at the last known page or
+    when `stop` returns True; any fetches still queued are then cancelled.
+    A fetch or parse error also ends it, and marks the crawl incomplete.
+    """
+    site, budget, deadline = current_site(), current_retry_budget(), current_deadline()
+    window = max(1, min(window, MAX_REQUESTS_PER_HOST))
+
+    def fetch(page_number):
+        # Prefetch threads report timings and spend retries and time as the caller's site.
+        _fetch_context.site = site
+        _fetch_context.retry_budget = budget
+        _fetch_context.deadline = deadline
+        page = page_url(page_number)
+        print(f"Scraping page: {page}")
+        response = http_get(page)
         response.raise_for_status()
+        return response
+
+    pending = {}
+    executor = ThreadPoolExecutor(max_workers=window)
+    try:
+        page_number = first_page
+        while True:
+            future = pending.pop(page_number, None)
+            response = future.result() if future else fetch(page_number)
+            tenders, last_page = parse_page(response, page_number)
+            yield from tenders
+            if not tenders or last_page <= page_number or (stop and stop(tenders)):
+                break
+            page_number += 1
+            for ahead in range(page_number, min(page_number + window, last_page + 1)):
+                if ahead not in pending:
+                    pending[ahead] = executor.submit(fetch, ahead)
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching the HAREDA URL: {e}")
-        return []
+        print(f"Error fetching the URL: {e}")
+        mark_crawl_incomplete()
+    except PageNotModified:
+        raise
+    except Exception as e:
+        print(f"An error occurred during scraping: {e}")
+        mark_crawl_incomplete()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-    tenders_table = None
-    for table in soup.find_all('table'):
-        header = table.find('th', string=re.compile('Title', re.I))
-        if header:
-            tenders_table = table
-            break
-    
-    if not tenders_table:
-        print("HAREDA: Could not find the tenders table on the page.")
-        return []
-    
-    for row in tenders_table.find_all('tr')[1:]:
-        cells = row.find_all('td')
-        if len(cells) > 1:
-            try:
-                title_cell = cells[0] if cells[0].get_text(strip=True) else cells[1]
-                title = title_cell.get_text(strip=True)
-                link_element = row.find('a', href=True)
-                href = link_element.get('href') if link_element else '#'
-                base_url = "https://hareda.gov.in"
-                full_url = href if href.startswith(('http://', 'https://')) else f"{base_url}{href}"
-                tender_list.append({
-                    'title': title,
-                    'url': full_url
-                })
-            except (IndexError, AttributeError):
-                continue
-    return tender_list
+# --- Site Extraction ---
 
-def get_breda_tenders(url):
+class ElementLocator:
     """
-    Scrapes the BREDA website for all tender details.
-    This site uses ASP.NET and displays tenders in a table.
+    Compiled "title"/"link" locator of an extract spec (also used for listing
+    "has" tests and "Next" links). Finds the first element in a scope that
+    matches the CSS selector and, if given, the exact "text" or the
+    case-insensitive "text_pattern" of its string.
     """
-    tender_list = []
-    try:
-        response = requests.get(url, verify=False, timeout=10)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching the BREDA URL: {e}")
-        return []
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-    tenders_table = soup.find('table', {'id': 'ContentPlaceHolder1_GridView1'})
+    def __init__(self, spec):
+        self.selector = sv.compile(spec['selector']) if 'selector' in spec else None
+        self.text = spec.get('text')
+        self.text_pattern = re.compile(spec['text_pattern'], re.I) if 'text_pattern' in spec else None
+        self.cell = spec.get('cell')
+        self.cells = spec.get('cells')
+        self.from_cell = spec.get('from_cell')
+        self.outer_strip = spec.get('strip') == 'outer'
+        self.uses_cells = self.cell is not None or self.cells is not None or self.from_cell is not None
+
+    def accepts(self, element):
+        if self.text is None and self.text_pattern is None:
+            return True
+        string = element.string
+        if string is None or (self.text is not None and string != self.text):
+            return False
+        return self.text_pattern is None or bool(self.text_pattern.search(string))
+
+    def first(self, scope, include_self=False):
+        """Returns the first matching element within `scope` (or `scope` itself, with `include_self`)."""
+        if self.selector is None or (include_self and self.selector.match(scope)):
+            return scope if self.accepts(scope) else None
+        return next((element for element in self.selector.iselect(scope) if self.accepts(element)), None)
+
+    def find(self, row, cells):
+        """Locates the element in a listing row, searching the configured cells if any."""
+        if self.cells is not None:
+            candidates = [cells[index] for index in self.cells]
+            scopes = [next((cell for cell in candidates if cell.get_text(strip=True)), candidates[-1])]
+        elif self.from_cell is not None:
+            scopes = cells[self.from_cell:]
+        elif self.cell is not None:
+            scopes = [cells[self.cell]]
+        else:
+            scopes = [row]
+        for scope in scopes:
+            element = self.first(scope, include_self=True)
+            if element is not None:
+                return element
+        return None
 
-    if tenders_table:
-        for row in tenders_table.find_all('tr')[1:]:
-            cells = row.find_all('td')
-            if len(cells) > 2:
+    def text_of(self, element):
+        return element.text.strip() if self.outer_strip else element.get_text(strip=True)
+
+class SiteExtractor:
+    """
+    A website's "extract" and "pagination" spec (see WEBSITES) compiled once:
+    selectors are compiled with soupsieve and patterns with re, so scraping a
+    page only walks the listing rows.
+    """
+
+    def __init__(self, website):
+        spec = website['extract']
+        self.name = website['name']
+        self.url = website['url']
+        listing = spec.get('listing')
+        if isinstance(listing, dict):
+            self.listing = sv.compile(listing['selector'])
+            self.listing_has = ElementLocator(listing['has'])
+        else:
+            self.listing = sv.compile(listing) if listing else None
+            self.listing_has = None
+        self.rows = sv.compile(spec['rows'])
+        self.skip_rows = spec.get('skip_rows', 0)
+        self.min_cells = spec.get('min_cells', 0)
+        self.title = ElementLocator(spec['title']) if 'title' in spec else None
+        self.link = ElementLocator(spec['link']) if 'link' in spec else None
+        self.uses_cells = bool(self.min_cells) or any(locator and locator.uses_cells for locator in (self.title, self.link))
+        self.url_is_page = spec.get('url') == 'page'
+        self.join = spec.get('join', 'urljoin')
+        self.base_url = spec.get('base_url', website['url'])
+        self.default_href = spec.get('default_href')
+        self.default_title = spec.get('default_title')
+        self.title_pattern = re.compile(spec['title_pattern'], re.I) if 'title_pattern' in spec else None
+        self.skip_url_titles = spec.get('skip_url_titles', False)
+
+        pagination = website.get('pagination') or {}
+        self.pagination = pagination.get('type')
+        self.next_link = ElementLocator(pagination) if self.pagination == 'next_link' else None
+        self.page_param = pagination.get('param', 'page')
+        self.page_links = sv.compile(pagination['links']) if 'links' in pagination else None
+
+    def find_listing(self, soup):
+        if self.listing is None:
+            return soup
+        for element in self.listing.iselect(soup):
+            if self.listing_has is None or self.listing_has.first(element) is not None:
+                return element
+        return None
+
+    def resolve(self, href):
+        if self.join == 'none':
+            return href
+        if self.join == 'prefix':
+            return href if href.startswith(('http://', 'https://')) else f"{self.base_url}{href}"
+        return requests.compat.urljoin(self.base_url, href)
+
+    def extract_row(self, row, cells, page_url):
+        link = self.link.find(row, cells) if self.link else None
+        title_tag = self.title.find(row, cells) if self.title else link
+        if title_tag is not None:
+            title = (self.title or self.link).text_of(title_tag)
+        else:
+            title = self.default_title
+        if title is None:
+            return None
+
+        if self.url_is_page:
+            url = page_url
+        else:
+            href = link.get('href') if link is not None else self.default_href
+            if not href:
+                return None
+            url = self.resolve(href)
+
+        if self.title_pattern and not self.title_pattern.search(title):
+            return None
+        if self.skip_url_titles and title == url:
+            return None
+        return {'title': title, 'url': url}
+
+    def extract(self, soup, page_url):
+        """Returns the tenders listed in `soup`, or None if the listing itself is missing."""
+        with timed('extract', self.name, url=page_url) as fields:
+            listing = self.find_listing(soup)
+            if listing is None:
+                print(f"{self.name}: Could not find the tender listing on the page.")
+                return None
+            check_listing_fingerprint(listing)
+            tender_list = []
+            for row in self.rows.select(listing)[self.skip_rows:]:
+                cells = row.find_all('td') if self.uses_cells else []
+                if len(cells) < self.min_cells:
+                    continue
                 try:
-                    title = cells[2].get_text(strip=True)
-                    download_link_element = None
-                    for cell in cells[2:]:
-                        link = cell.find('a', href=re.compile(r'\.pdf$', re.I))
-                        if link:
-                            download_link_element = link
-                            break
-                    
-                    href = download_link_element.get('href') if download_link_element else '#'
-                    
-                    base_url = "https://breda.co.in/"
-                    full_url = href if href.startswith(('http://', 'https://')) else f"{base_url}{href}"
-                    
-                    tender_list.append({
-                        'title': title,
-                        'url': full_url
-                    })
+                    tender = self.extract_row(row, cells, page_url)
                 except (IndexError, AttributeError):
                     continue
-    return tender_list
+                if tender:
+                    tender_list.append(tender)
+            fields['tenders'] = len(tender_list)
+            return tender_list
+
+    def next_page_url(self, soup):
+        link = self.next_link.first(soup) if self.next_link else None
+        if link is None or not link.get('href'):
+            return None
+        return requests.compat.urljoin(self.url, link.get('href'))
+
+    def numbered_page_url(self, page_number):
+        separator = '&' if '?' in self.url else '?'
+        return f"{self.url}{separator}{self.page_param}={page_number}"
+
+    def parse_numbered_page(self, response, page_number):
+        """parse_page callback for crawl_numbered_pages()."""
+        soup = make_soup(response.content, self.name)
+        tenders = self.extract(soup, response.url) or []
+        if not tenders:
+            print(f"No tenders found on page {page_number}. Ending pagination.")
+            return [], page_number
+        page_links = self.page_links.select(soup) if self.page_links else []
+        if not page_links:
+            print("No pagination links found. Assuming single page. Ending pagination.")
+            return tenders, page_number
+        last_page = max([int(a.get_text()) for a in page_links if a.get_text().isdigit()] + [page_number])
+        if last_page == page_number:
+            print(f"Reached the last page ({page_number}) based on pagination links. Ending pagination.")
+        return tenders, last_page
+
+# Compiled on first use, so a run only compiles the sites it scrapes.
+SITE_EXTRACTORS = {}
+
+def get_site_extractor(website):
+    """Returns the compiled extractor for a website, compiling it on first use or when its URL changed."""
+    extractor = SITE_EXTRACTORS.get(website['name'])
+    if extractor is None or extractor.url != website['url']:
+        extractor = SITE_EXTRACTORS[website['name']] = SiteExtractor(website)
+    return extractor
+
+def iter_static_tenders(website, stop=None):
+    """
+    Scrapes a "static" website over HTTP with its compiled extract spec,
+    following its pagination rule, and yields its tenders page by page.
+    Pagination ends early when `stop` (see IncrementalCrawl) returns True for
+    a page's tenders.
+    """
+    extractor = get_site_extractor(website)
+    if extractor.pagination == 'page_param':
+        yield from crawl_numbered_pages(extractor.numbered_page_url, extractor.parse_numbered_page, stop=stop)
+        return
 
-def get_tgredco_tenders(url):
+    page_url = website['url']
+    visited = set()
+    while page_url and page_url not in visited:
+        visited.add(page_url)
+        if extractor.pagination:
+            print(f"Scraping page: {page_url}")
+        try:
+            response = http_get(page_url)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching the {website['name']} URL: {e}")
+            mark_crawl_incomplete()
+            break
+
+        soup = make_soup(response.content, website['name'])
+        tenders = extractor.extract(soup, page_url)
+        if tenders is None:
+            mark_crawl_incomplete()
+            break
+        yield from tenders
+        if not extractor.pagination or (stop and stop(tenders)):
+            break
+        page_url = extractor.next_page_url(soup)
+        if not page_url:
+            print("No 'Next' link found. Ending pagination.")
+
+# --- Scraping Functions (BeautifulSoup) ---
+
+def get_tgredco_tenders(url, stop=None):
     """
-    Scrapes the TGREDCO tenders page for all tender details.
+    Scrapes the TGREDCO tenders page for all tender details. Each tender card
+    can carry several documents, so this site keeps a hand-written scraper;
+    `stop` is accepted for the CUSTOM_SCRAPERS signature (the page is not
+    paginated).
     """
     tender_list = []
     try:
-        response = requests.get(url, timeout=10)
+        response = http_get(url)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Error fetching the TGREDCO URL: {e}")
         return []
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = make_soup(response.content, "TGREDCO")
     tenders_container = soup.find('div', id='tenders')
     
     if not tenders_container:
@@ -403,259 +1374,134 @@ def get_tgredco_tenders(url):
     
     return tender_list
 
-def get_seci_tenders(url):
-    """
-    Scrapes the SECI tenders page for all tender details.
-    """
-    tender_list = []
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching the SECI URL: {e}")
-        return []
-
-    soup = BeautifulSoup(response.content, 'html.parser')
-    tenders_table = soup.find('table', {'id': 'tender-list'})
-
-    if tenders_table:
-        for row in tenders_table.find_all('tr')[1:]:
-            cells = row.find_all('td')
-            if len(cells) > 4:
-                try:
-                    title = cells[4].get_text(strip=True)
-                    link = cells[-1].find('a')
-                    href = link.get('href') if link else None
-                    
-                    if href:
-                        full_url = requests.compat.urljoin(url, href)
-                        tender_list.append({
-                            'title': title,
-                            'url': full_url
-                        })
-                except (IndexError, AttributeError):
-                    continue
-    return tender_list
-
+# --- Browser Pool (Selenium) ---
 
-def get_ireda_tenders(url):
-    """Scrapes the IREDA tenders page for all tender details."""
-    tender_list = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    try:
-        response = requests.get(url, timeout=10, headers=headers)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching the URL for IREDA: {e}")
-        return []
-
-    soup = BeautifulSoup(response.content, 'html.parser')
-    tender_header = soup.find('th', string=re.compile('Title', re.I))
-    
-    if tender_header:
-        tenders_table = tender_header.find_parent('table')
-        if tenders_table:
-            for row in tenders_table.find_all('tr')[1:]:
-                cells = row.find_all('td')
-                if len(cells) >= 3:
-                    try:
-                        title = cells[1].get_text(strip=True)
-                        link = cells[2].find('a')
-                        href = link.get('href') if link else None
-                        
-                        if href:
-                            full_url = requests.compat.urljoin(url, href)
-                            tender_list.append({
-                                'title': title,
-                                'url': full_url
-                            })
-                    except (IndexError, AttributeError):
-                        continue
-    return tender_list
-
-def get_niwe_tenders(url):
+def new_chrome_driver(capture_network=False):
     """
-    Scrapes the NIWE tenders page for all tender details across all pages.
+    Launches a headless Chrome instance with the options all scrapers share.
+    With `capture_network`, Chrome's performance log is enabled so that the
+    page's XHR traffic can be inspected (see discover_api_endpoint).
     """
-    tender_list = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    page_number = 1
-    while True:
-        page_url = f"{url}?page={page_number}"
-        print(f"Scraping page: {page_url}")
-        
-        try:
-            response = requests.get(page_url, timeout=10, headers=headers, verify=False)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            tenders_table = soup.find('table', class_='tender-table')
-            
-            current_page_tenders = []
-            if tenders_table and tenders_table.find_all('tr'):
-                for row in tenders_table.find_all('tr')[1:]:
-                    cells = row.find_all('td')
-                    if len(cells) >= 5:
-                        try:
-                            title = cells[1].get_text(strip=True)
-                            link = cells[4].find('a')
-                            href = link.get('href') if link else None
-                            
-                            if href:
-                                full_url = requests.compat.urljoin(url, href)
-                                current_page_tenders.append({
-                                    'title': title,
-                                    'url': full_url
-                                })
-                        except (IndexError, AttributeError):
-                            continue
-            
-            if not current_page_tenders:
-                print(f"No tenders found on page {page_number}. Ending pagination.")
-                break
-            
-            tender_list.extend(current_page_tenders)
-            
-            pagination_container = soup.find('ul', class_='pagination-list')
-            if pagination_container:
-                next_page_link = pagination_container.find('a', string=lambda text: text and text.isdigit() and int(text) > page_number)
-                if not next_page_link:
-                    print(f"Reached the last page ({page_number}) based on pagination links. Ending pagination.")
-                    break
-            else:
-                print("No pagination container found. Assuming single page. Ending pagination.")
-                break
-            
-            page_number += 1
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching the URL: {e}")
-            break
-        except Exception as e:
-            print(f"An error occurred during scraping: {e}")
-            break
-            
-    return tender_list
+    load_selenium()
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    if capture_network:
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return webdriver.Chrome(options=options)
 
-def get_nise_tenders(url):
+class BrowserPool:
     """
-    Scrapes the NISE tenders page for all tender details.
+    A pool of up to `size` headless Chrome instances. Browsers are launched on
+    first use and handed out with acquire(); release() resets the browser to a
+    blank tab for the next scraper, and quits it once it has served `max_uses`
+    checkouts or no longer responds. cancel() quits the browsers a site has
+    checked out when it runs out of time.
     """
-    tender_list = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    }
-    try:
-        response = requests.get(url, timeout=10, headers=headers, verify=False)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching the NISE URL: {e}")
-        return []
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-    tenders_table = soup.find('table', id='exampleTender')
-    if tenders_table:
-        for row in tenders_table.find('tbody').find_all('tr'):
-            cells = row.find_all('td')
-            if len(cells) >= 3:
+    def __init__(self, size=BROWSER_POOL_SIZE, max_uses=BROWSER_MAX_USES):
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = []
+        self._uses = {}
+        self._owners = {}
+        self._cancelled = set()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Returns an idle browser, launching one if none is available. Blocks while all are in use."""
+        self._slots.acquire()
+        with self._lock:
+            driver = self._idle.pop() if self._idle else None
+        if driver is None:
+            try:
+                driver = new_chrome_driver()
+            except Exception:
+                self._slots.release()
+                raise
+        with self._lock:
+            self._uses[driver] = self._uses.get(driver, 0) + 1
+            self._owners[driver] = current_site()
+        return driver
+
+    def release(self, driver, broken=False):
+        """Returns a browser to the pool, or quits it if it is worn out or has crashed."""
+        try:
+            with self._lock:
+                self._owners.pop(driver, None)
+                if driver in self._cancelled:
+                    # Already quit by cancel()
+                    self._cancelled.discard(driver)
+                    self._uses.pop(driver, None)
+                    return
+                worn_out = self._uses.get(driver, 0) >= self.max_uses
+            if not broken and not worn_out:
                 try:
-                    title_cell = cells[2]
-                    link = title_cell.find('a')
-                    if link and link.get('href'):
-                        title = link.get_text(strip=True)
-                        href = link.get('href')
-                        tender_pattern = re.compile(r'tender|eoi|rfp|bid|quotation|proposal|corrigendum', re.I)
-                        if tender_pattern.search(title):
-                            full_url = requests.compat.urljoin(url, href)
-                            tender_list.append({
-                                'title': title,
-                                'url': full_url
-                            })
-                except (IndexError, AttributeError):
-                    continue
-    return tender_list
-    
-def get_mahapreit_tenders(url):
-    """Scrapes all pages of the MAHAPREIT tenders section for all tender details."""
-    tender_list = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    page_url = url
-    
-    while page_url:
-        print(f"Scraping page: {page_url}")
+                    driver.delete_all_cookies()
+                    driver.get('about:blank')
+                except WebDriverException as e:
+                    print(f"Browser stopped responding, recycling it: {e}")
+                    broken = True
+            if broken or worn_out:
+                self._discard(driver)
+            else:
+                with self._lock:
+                    self._idle.append(driver)
+        finally:
+            self._slots.release()
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(driver, None)
         try:
-            response = requests.get(page_url, timeout=10, headers=headers)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching the MAHAPREIT URL: {e}")
-            break
-
-        soup = BeautifulSoup(response.content, 'html.parser')
-        tender_blocks = soup.find_all('div', class_='post-item')
-        
-        for block in tender_blocks:
+            driver.quit()
+        except Exception as e:
+            print(f"Error shutting down browser: {e}")
+
+    def cancel(self, site):
+        """Quits the browsers checked out by `site`, so that its scraper's next browser call fails."""
+        with self._lock:
+            drivers = [driver for driver, owner in self._owners.items() if owner == site]
+            self._cancelled.update(drivers)
+        for driver in drivers:
             try:
-                title_tag = block.find('h3').find('a')
-                title = title_tag.get_text(strip=True) if title_tag else "No Title Found"
-                
-                link_tag = block.find('a', string='Download')
-                href = link_tag.get('href') if link_tag else None
-                
-                if href:
-                    full_url = requests.compat.urljoin(url, href)
-                    tender_list.append({
-                        'title': title,
-                        'url': full_url
-                    })
-            except (IndexError, AttributeError):
-                continue
-        
-        pagination_container = soup.find('div', class_='pagination')
-        next_link_element = pagination_container.find('a', string=re.compile('Next', re.I)) if pagination_container else None
-        
-        if next_link_element and next_link_element.get('href'):
-            page_url = requests.compat.urljoin(url, next_link_element.get('href'))
-        else:
-            print("No 'Next' button found. Ending pagination.")
-            page_url = None
-    
-    return tender_list
+                driver.quit()
+            except Exception as e:
+                print(f"Error shutting down browser: {e}")
+
+    def close(self):
+        """Quits all idle browsers."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+BROWSER_POOL = BrowserPool()
 
 # --- GTAI Scraper (updated) ---
-def get_gtai_tenders(url):
+def get_gtai_tenders(url, stop=None):
     """
     Scrapes the GTAI search page using Selenium, handling pagination by clicking
-    the "next page" button.
+    the "next page" button, and yields each page's tenders as it is read.
+    Pagination ends early when `stop` returns True for a page's tenders.
     """
-    tender_list = []
-    
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    
-    driver = webdriver.Chrome(options=options)
+    driver = BROWSER_POOL.acquire()
     
     try:
         print("Navigating to the initial GTAI URL...")
         driver.get(url)
         
         # Wait for the first page to load
-        WebDriverWait(driver, 20).until(
+        browser_wait(driver, 20).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, 'li.result-item'))
         )
         
         while True:
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
+            soup = make_soup(driver.page_source, "GTAI")
             tender_items = soup.find_all('li', class_='result-item')
+            page_tenders = []
             
             for item in tender_items:
                 content_div = item.find('div', class_='content')
@@ -667,11 +1513,15 @@ def get_gtai_tenders(url):
                         base_url = "https://www.gtai.de"
                         full_url = f"{base_url}{href}"
                         
-                        tender_list.append({
+                        page_tenders.append({
                             'title': title,
                             'url': full_url
                         })
 
+            yield from page_tenders
+            if stop and stop(page_tenders):
+                break
+
             # Check for the next page button
             try:
                 # Find the 'Next page' link
@@ -683,7 +1533,7 @@ def get_gtai_tenders(url):
                 print("Clicked the next page button using JavaScript.")
                 
                 # Wait for a new result to appear on the new page
-                WebDriverWait(driver, 20).until(
+                browser_wait(driver, 20).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, 'li.result-item'))
                 )
             
@@ -692,44 +1542,39 @@ def get_gtai_tenders(url):
                 break
             except ElementClickInterceptedException as e:
                 print(f"Caught an element click interception error for GTAI: {e}. Stopping.")
+                mark_crawl_incomplete()
                 break
             except Exception as e:
                 print(f"An error occurred while trying to paginate GTAI: {e}")
+                mark_crawl_incomplete()
                 break
                 
     except Exception as e:
         print(f"An error occurred during GTAI scraping: {e}")
+        mark_crawl_incomplete()
     finally:
-        driver.quit()
-        
-    return tender_list
+        BROWSER_POOL.release(driver)
 
 # --- NEW ADB Scraper ---
-def get_adb_tenders(url):
+def get_adb_tenders(url, stop=None):
     """
-    Scrapes the ADB tenders page using Selenium to handle dynamic content and pagination.
+    Scrapes the ADB tenders page using Selenium to handle dynamic content and
+    pagination, yielding each page's tenders as it is read. Pagination ends
+    early when `stop` returns True for a page's tenders.
     """
-    tender_list = []
-    
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    
-    driver = webdriver.Chrome(options=options)
-    max_retries = 3
+    driver = BROWSER_POOL.acquire()
 
     try:
         print("Navigating to the initial ADB URL...")
         driver.get(url)
         
         print("Waiting for the page to be fully ready...")
-        WebDriverWait(driver, 30).until(
+        browser_wait(driver, 30).until(
             lambda d: d.execute_script('return document.readyState') == 'complete'
         )
 
         try:
-            cookie_accept_button = WebDriverWait(driver, 5).until(
+            cookie_accept_button = browser_wait(driver, 5).until(
                 EC.element_to_be_clickable((By.ID, 'onetrust-accept-btn-handler'))
             )
             cookie_accept_button.click()
@@ -742,12 +1587,12 @@ def get_adb_tenders(url):
         page_number = 1
         
         try:
-            WebDriverWait(driver, 20).until(
+            browser_wait(driver, 20).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, 'div.item.linked'))
             )
         except TimeoutException:
             print("Initial wait for tender items timed out. The page may not have loaded correctly.")
-            return []
+            return
 
         while True:
             if page_number > 20:
@@ -757,17 +1602,19 @@ def get_adb_tenders(url):
             try:
                 print(f"Scraping page {page_number}...")
                 
-                WebDriverWait(driver, 20).until(
+                browser_wait(driver, 20).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, 'div.item.linked'))
                 )
 
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
+                soup = make_soup(driver.page_source, "ADB")
                 tender_items = soup.find_all('div', class_='item linked')
                 
                 if not tender_items:
                     print(f"No tenders found on page {page_number}. Ending pagination.")
                     break
 
+                page_tenders = []
+
                 for item in tender_items:
                     title_tag = item.find('div', class_='item-title')
                     link_tag = item.find('a', href=True)
@@ -778,10 +1625,14 @@ def get_adb_tenders(url):
                         base_url = "https://www.adb.org"
                         full_url = requests.compat.urljoin(base_url, href)
                         
-                        tender_list.append({
+                        page_tenders.append({
                             'title': title,
                             'url': full_url
                         })
+
+                yield from page_tenders
+                if stop and stop(page_tenders):
+                    break
                 
                 next_page_link = driver.find_element(By.CSS_SELECTOR, 'a[title="Go to next page"]')
                 
@@ -795,7 +1646,7 @@ def get_adb_tenders(url):
                 
                 driver.execute_script("arguments[0].click();", next_page_link)
                 
-                WebDriverWait(driver, 20).until(EC.staleness_of(first_item_on_page))
+                browser_wait(driver, 20).until(EC.staleness_of(first_item_on_page))
                 
                 page_number += 1
             
@@ -803,211 +1654,1554 @@ def get_adb_tenders(url):
                 print("No more pages found. Reached the end of pagination.")
                 break
             except Exception as e:
-                retries = 0
-                while retries < max_retries:
-                    print(f"An unexpected error occurred during pagination for page {page_number}: {e}. Retrying... (Attempt {retries + 1}/{max_retries})")
-                    try:
-                        driver.refresh()
-                        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div.item.linked')))
-                        print(f"Successfully refreshed and re-attempting to scrape page {page_number}.")
-                        break
-                    except Exception as refresh_error:
-                        retries += 1
-                        print(f"Refresh failed: {refresh_error}. Retrying...")
-                
-                if retries == max_retries:
-                    print(f"Failed to recover from error after {max_retries} retries on page {page_number}. Ending scraper.")
+                print(f"An unexpected error occurred during pagination for page {page_number}: {e}.")
+                budget = current_retry_budget()
+                if budget and not budget.take():
+                    print(f"ADB's retry budget is spent. Ending scraper on page {page_number}.")
+                    mark_crawl_incomplete()
+                    break
+
+                def refresh():
+                    driver.refresh()
+                    browser_wait(driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div.item.linked')))
+
+                try:
+                    with_retries(refresh, (WebDriverException,), budget=budget, description=f"Refreshing ADB page {page_number}")
+                    print(f"Successfully refreshed and re-attempting to scrape page {page_number}.")
+                except WebDriverException as refresh_error:
+                    print(f"Failed to recover from error on page {page_number} ({refresh_error}). Ending scraper.")
+                    mark_crawl_incomplete()
                     break
 
     except Exception as e:
         print(f"An error occurred during scraping: {e}")
+        mark_crawl_incomplete()
     finally:
-        driver.quit()
-        
-    return tender_list
+        BROWSER_POOL.release(driver)
 
 
 # --- Scraping Functions (Selenium) ---
 
-def get_dynamic_tenders(url, wait_selector, title_selector, link_selector):
+def get_browser_tenders(website):
     """
-    Uses Selenium to scrape tenders from a dynamic website.
+    Renders a "browser" website in a pooled Chrome and, once its
+    `wait_selector` has appeared, extracts the tenders with its compiled
+    extract spec.
     """
     tender_list = []
     
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    
-    driver = webdriver.Chrome(options=options)
+    driver = BROWSER_POOL.acquire()
 
     try:
-        driver.get(url)
-        
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
-        )
-        
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        items = soup.select(wait_selector)
+        with timed('render', website['name'], url=website['url']):
+            driver.get(website['url'])
+            
+            browser_wait(driver, 20).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, website['wait_selector']))
+            )
         
-        for item in items:
-            title_tag = item.select_one(title_selector)
-            link_tag = item.select_one(link_selector)
-
-            if title_tag and link_tag:
-                title = title_tag.get_text(strip=True)
-                href = link_tag.get('href')
-                
-                full_url = requests.compat.urljoin(url, href)
-                
-                if "RRECL" in url and title == full_url:
-                    continue
-
-                tender_list.append({
-                    'title': title,
-                    'url': full_url
-                })
+        soup = make_soup(driver.page_source, website['name'])
+        tender_list = get_site_extractor(website).extract(soup, website['url']) or []
         
+    except PageNotModified:
+        raise
     except Exception as e:
-        print(f"An error occurred during Selenium scraping for {url}: {e}")
+        print(f"An error occurred during Selenium scraping for {website['url']}: {e}")
     finally:
-        driver.quit()
+        BROWSER_POOL.release(driver)
         
     return tender_list
 
-# --- File and Email Handling ---
+# --- API Extraction (Network Capture) ---
 
-def load_seen_tenders(filename, website_name):
-    """Loads previously seen tenders for a specific website from a single file."""
-    if not os.path.exists(filename) or os.stat(filename).st_size == 0:
-        return set()
+PAGE_PARAM_NAMES = ('page', 'pageNumber', 'page_number', 'pageNo', 'pageIndex', 'p')
+
+def _json_item_lists(data, path=()):
+    """Yields (key path, list) for every list of objects nested in a JSON document."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _json_item_lists(value, path + (key,))
+    elif isinstance(data, list) and data and all(isinstance(item, dict) for item in data):
+        yield list(path), data
+
+def _resolve_json_path(data, path):
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+def match_api_items(data, titles, hrefs):
+    """
+    Works out how a JSON document maps onto the tenders rendered on the page:
+    the list holding them, the key carrying the title and the key plus URL
+    template that reproduce the rendered links. Returns None if no list in
+    the document contains the rendered titles.
+    """
+    best = None
+    for path, items in _json_item_lists(data):
+        for key in items[0]:
+            matches = sum(1 for item in items if isinstance(item.get(key), str) and item[key].strip() in titles)
+            if matches and (best is None or matches > best[0]):
+                best = (matches, path, key, items)
+    if best is None:
+        return None
+    _, items_path, title_key, items = best
+
+    best_link = None
+    for key in items[0]:
+        if key == title_key:
+            continue
+        for item in items:
+            value = str(item.get(key, ''))
+            href = next((h for h in hrefs if len(value) >= 3 and value in h), None)
+            if href is None:
+                continue
+            template = href.replace(value, '{}', 1)
+            hits = sum(1 for other in items if template.format(other.get(key, '')) in hrefs)
+            if best_link is None or hits > best_link[0]:
+                best_link = (hits, key, template)
+            break
+    if best_link is None:
+        return None
+    return {'items_path': items_path, 'title_key': title_key, 'url_key': best_link[1], 'url_template': best_link[2]}
+
+def discover_api_endpoint(website):
+    """
+    Loads a dynamic website in a browser with network capture enabled and
+    looks for the JSON response its tender list is rendered from. Returns the
+    endpoint description to store in SITE_API_FILE, or None if none matched.
+    """
+    driver = new_chrome_driver(capture_network=True)
     try:
-        with open(filename, "r") as f:
-            data = json.load(f)
-            return {t['title'] for t in data.get(website_name, [])}
-    except (IOError, json.JSONDecodeError) as e:
-        print(f"Error loading seen tenders from file '{filename}': {e}")
-        return set()
+        driver.get(website['url'])
+        WebDriverWait(driver, 30).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, website['wait_selector']))
+        )
+        soup = make_soup(driver.page_source, website['name'])
+        rendered = get_site_extractor(website).extract(soup, website['url']) or []
+        titles = {tender['title'] for tender in rendered}
+        hrefs = {tender['url'] for tender in rendered}
+        if not titles:
+            print(f"{website['name']}: no tenders rendered, nothing to match against.")
+            return None
+
+        for entry in driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            if message.get('method') != 'Network.responseReceived':
+                continue
+            response = message['params']['response']
+            if 'json' not in response.get('mimeType', ''):
+                continue
+            try:
+                body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': message['params']['requestId']})
+                data = json.loads(body['body'])
+            except (WebDriverException, ValueError, KeyError):
+                continue
+            mapping = match_api_items(data, titles, hrefs)
+            if mapping:
+                endpoint = response['url']
+                mapping['endpoint'] = endpoint
+                for name, value in parse_qsl(urlparse(endpoint).query):
+                    if name in PAGE_PARAM_NAMES and value.isdigit():
+                        mapping['page_param'] = name
+                        mapping['first_page'] = int(value)
+                        break
+                return mapping
+        print(f"{website['name']}: none of the captured JSON responses contained the rendered tenders.")
+        return None
+    finally:
+        driver.quit()
+
+def discover_api_endpoints(site_names, filename=SITE_API_FILE):
+    """Runs API discovery for the named dynamic websites and records the results in `filename`."""
+    endpoints = load_site_api_endpoints(filename)
+    for website in WEBSITES:
+        if website['name'] not in site_names or not website['dynamic']:
+            continue
+        print(f"Discovering the API behind {website['name']}...")
+        try:
+            mapping = discover_api_endpoint(website)
+        except Exception as e:
+            print(f"An error occurred during API discovery for {website['name']}: {e}")
+            continue
+        if mapping:
+            endpoints[website['name']] = mapping
+            print(f"Recorded {mapping['endpoint']} for {website['name']}.")
+    with open(filename, "w") as f:
+        json.dump(endpoints, f, indent=4)
+
+def get_api_tenders(website, api, stop=None):
+    """
+    Fetches a dynamic website's tenders straight from its recorded JSON
+    endpoint, following the page parameter if one was recorded (until `stop`
+    returns True for a page's tenders, if given, or at a page that lists no
+    tender not already collected, as an endpoint that ignores or clamps the
+    page parameter does). Returns None when the endpoint fails or its
+    response no longer has the recorded shape, so that the caller can fall
+    back to the browser.
+    """
+    tender_list = []
+    urls = set()
+    page = api.get('first_page')
+    for _ in range(API_MAX_PAGES if 'page_param' in api else 1):
+        endpoint = api['endpoint']
+        if 'page_param' in api:
+            parts = urlparse(endpoint)
+            query = dict(parse_qsl(parts.query))
+            query[api['page_param']] = str(page)
+            endpoint = urlunparse(parts._replace(query=urlencode(query)))
+        try:
+            response = http_get(endpoint, headers={'Accept': 'application/json'})
+            response.raise_for_status()
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error fetching the {website['name']} API: {e}")
+            return None
+
+        items = _resolve_json_path(data, api['items_path'])
+        if not isinstance(items, list):
+            print(f"{website['name']}: API response no longer contains the tender list.")
+            return None
+        if not items:
+            break
+        page_start = len(tender_list)
+        for item in items:
+            if not isinstance(item, dict) or api['title_key'] not in item or api['url_key'] not in item:
+                print(f"{website['name']}: API items no longer have the recorded fields.")
+                return None
+            url = api['url_template'].format(item[api['url_key']])
+            if url in urls:
+                continue
+            urls.add(url)
+            tender_list.append({
+                'title': str(item[api['title_key']]).strip(),
+                'url': url
+            })
+        if len(tender_list) == page_start:
+            print(f"{website['name']}: API page {page} repeats earlier results. Ending pagination.")
+            break
+        if stop and stop(tender_list[page_start:]):
+            break
+        if 'page_param' in api:
+            page += 1
+    return tender_list or None
+
+# --- Tender Identity ---
 
-def save_seen_tenders(tenders, filename, website_name):
-    """Saves the current list of tenders for a specific website to a single file."""
+def normalize_text(text):
+    """Folds a title for comparison: NFKC (which turns NBSPs into spaces), single spaces, casefolded."""
+    return " ".join(unicodedata.normalize('NFKC', text or "").split()).casefold()
+
+def canonical_url(url):
+    """
+    Normalizes a URL for comparison: lowercase scheme and host, sorted query
+    and no fragment, except for hash-routed paths such as RRECL's '#/pages/...'.
+    """
+    parts = urlparse((url or "").strip())
+    fragment = parts.fragment if parts.fragment.startswith('/') else ''
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.params, query, fragment))
+
+def tender_key(website, tender):
+    """
+    Returns a compact (64-bit) identity for a tender. It is derived from the
+    site's reference number when `ref_pattern` matches, from the canonical
+    URL for sites keyed by URL, and from the normalized title otherwise.
+    """
+    identity = None
+    if website.get('ref_pattern'):
+        for text in (tender['title'], tender.get('url') or ''):
+            match = re.search(website['ref_pattern'], text, re.I)
+            if match:
+                identity = "ref:" + normalize_text(match.group(0))
+                break
+    if identity is None:
+        if website.get('key_by') == 'url':
+            identity = "url:" + canonical_url(tender.get('url'))
+        else:
+            identity = "title:" + normalize_text(tender['title'])
+    digest = hashlib.blake2b(f"{website['name']}|{identity}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+# --- Tender Enrichment ---
+
+_DETAIL_DATE = (r"(\d{1,2}[./-]\d{1,2}[./-]\d{2,4}"
+                r"|\d{1,2}(?:st|nd|rd|th)?[ -]?[A-Za-z]{3,9}\.?,?[ -]?\d{4}"
+                r"|[A-Za-z]{3,9}\.? \d{1,2}(?:st|nd|rd|th)?,? \d{4})")
+_DETAIL_AMOUNT = (r"((?:(?:Rs\.?|INR|₹|USD|US\$|EUR|€|\$) ?)?\d[\d,]*(?:\.\d+)?"
+                  r"(?: ?(?:lakhs?|lacs?|crores?|cr\b|million|mn\b)|/-)?)")
+
+# Applied, in order, to a document's text with its whitespace collapsed.
+# The first match of each gives that detail.
+TENDER_DETAIL_PATTERNS = {
+    'closing_date': re.compile(
+        r"(?:(?:last|closing|due|end) date|deadline|bid (?:submission )?(?:end|closing|due) date)"
+        r"[^0-9]{0,60}?" + _DETAIL_DATE, re.I),
+    'value': re.compile(
+        r"(?:estimated (?:cost|value)|tender value|contract value|project cost|value of (?:the )?(?:work|tender|contract))"
+        r"[^0-9₹$€]{0,40}?" + _DETAIL_AMOUNT, re.I),
+    'emd': re.compile(r"(?:\bEMD\b|earnest money(?: deposit)?)[^0-9₹$€]{0,40}?" + _DETAIL_AMOUNT, re.I),
+    'reference': re.compile(
+        r"(?:e-tender|tender|bid|NIT|RfS|RfP|RfQ|EoI|ref(?:erence)?)\.? ?(?:no|number|id|ref(?:erence)?)\.? ?[:.\-]? ?"
+        r"((?=[\w/.&\-()]*\d)[A-Z0-9][\w/.&\-()]{3,})", re.I),
+}
+MONTH_ABBREVIATIONS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+
+def normalize_tender_date(text):
+    """
+    Returns a date matched by TENDER_DETAIL_PATTERNS as YYYY-MM-DD, reading
+    numeric dates day first as Indian portals write them, or the text as it
+    is if it isn't a valid date.
+    """
+    numbers = re.findall(r"\d+", text)
+    months = [MONTH_ABBREVIATIONS.index(word[:3].lower()) + 1
+              for word in re.findall(r"[A-Za-z]+", text) if word[:3].lower() in MONTH_ABBREVIATIONS]
     try:
-        if os.path.exists(filename) and os.stat(filename).st_size > 0:
-            with open(filename, "r") as f:
-                data = json.load(f)
+        if months:
+            month = months[0]
+            day, year = int(numbers[0]), int(numbers[1])
         else:
-            data = {}
+            day, month, year = map(int, numbers[:3])
+        if year < 100:
+            year += 2000
+        return datetime(year, month, day).date().isoformat()
+    except (ValueError, IndexError):
+        return text
+
+def extract_tender_details(text):
+    """Returns the details TENDER_DETAIL_PATTERNS find in a document's text, e.g. {'closing_date': '2026-03-12'}."""
+    text = " ".join(text.split())
+    details = {}
+    for field, pattern in TENDER_DETAIL_PATTERNS.items():
+        match = pattern.search(text)
+        if match:
+            value = match.group(1).rstrip(".,;:")
+            details[field] = normalize_tender_date(value) if field == 'closing_date' else value
+    return details
+
+def fetch_document(url, max_bytes=ENRICH_MAX_BYTES):
+    """
+    Downloads a tender's linked page or document through the shared session,
+    with retries. Returns its body and content type, or None if it could not
+    be fetched or is larger than `max_bytes`. Documents bypass the HTTP
+    cache; the store remembers them instead (see TenderEnricher).
+    """
+    verify = TLS_VERIFY_BY_HOST.get(urlparse(url).netloc.lower(), True)
+
+    def send():
+        timeout = REQUEST_TIMEOUT
+        deadline = current_deadline()
+        if deadline:
+            deadline.check("Run deadline")
+            timeout = min(timeout, deadline.remaining())
+        with timed('fetch', url=url) as fetch:
+            with get_session().get(url, timeout=timeout, verify=verify, stream=True) as response:
+                fetch['status'] = response.status_code
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    raise requests.exceptions.HTTPError(f"{response.status_code} Server Error for url: {url}", response=response)
+                if not response.ok or int(response.headers.get('Content-Length') or 0) > max_bytes:
+                    return None
+                body = bytearray()
+                for chunk in response.iter_content(64 * 1024):
+                    body += chunk
+                    if len(body) > max_bytes:
+                        fetch['truncated'] = True
+                        return None
+                fetch['bytes'] = len(body)
+                return bytes(body), response.headers.get('Content-Type', '')
+
+    return with_retries(send, RETRYABLE_ERRORS + (requests.exceptions.HTTPError,), description=f"GET {url}")
+
+def document_text(body, content_type, max_pages=ENRICH_PDF_PAGES):
+    """Returns the text of an HTML page, or of the first `max_pages` pages of a PDF (with pypdf)."""
+    if body.startswith(b"%PDF") or 'pdf' in content_type:
+        pdf_reader = load_pypdf()
+        if pdf_reader is None:
+            return ""
+        try:
+            reader = pdf_reader(io.BytesIO(body))
+            return "\n".join(page.extract_text() or "" for page in reader.pages[:max_pages])
+        except Exception as e:  # pypdf raises a variety of errors on damaged files
+            print(f"Could not read PDF: {e}")
+            return ""
+    if 'html' in content_type or body.lstrip()[:1] == b"<":
+        return make_soup(body).get_text("\n")
+    return ""
+
+class TenderEnricher:
+    """
+    Enriches new tenders while the scrapers run: the page or document each
+    one links to is fetched on a pool of `max_workers` threads, and the
+    details found in it are kept in `found`, by canonical URL. Each URL is
+    fetched once per run, and documents the store already knows (by URL or
+    content hash) are not fetched or parsed again (see
+    TenderState.cached_document()). Tenders whose URL isn't their own (see
+    non_document_urls) are left alone.
+    """
 
-        data[website_name] = tenders
+    def __init__(self, state, max_workers=ENRICH_WORKERS, deadline=None):
+        self.state = state
+        self.deadline = deadline
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.lock = threading.Lock()
+        self.futures = {}
+        self.skipped_urls = {}
+        self.found = {}
+
+    def non_document_urls(self, website_name):
+        """
+        Canonical URLs a site's tenders can carry that aren't a tender's own
+        page or document: the site's listing, and the link of tenders without
+        one ("default_href"). None when no tender has a URL of its own
+        ("url": "page").
+        """
+        if website_name not in self.skipped_urls:
+            website = self.state.websites.get(website_name)
+            urls = set()
+            if website:
+                urls.add(canonical_url(website['url']))
+                if 'extract' in website:
+                    extractor = get_site_extractor(website)
+                    if extractor.url_is_page:
+                        urls = None
+                    elif extractor.default_href:
+                        urls.add(canonical_url(extractor.resolve(extractor.default_href)))
+            self.skipped_urls[website_name] = urls
+        return self.skipped_urls[website_name]
+
+    def submit(self, website_name, tender):
+        if not tender.get('url'):
+            return
+        url = canonical_url(tender['url'])
+        with self.lock:
+            skipped = self.non_document_urls(website_name)
+            if skipped is None or url in skipped or url in self.futures:
+                return
+            self.futures[url] = self.executor.submit(self.enrich, website_name, tender['url'])
+
+    def enrich(self, website_name, url):
+        _fetch_context.site = website_name
+        _fetch_context.deadline = self.deadline
+        try:
+            self.found[canonical_url(url)] = self.details(url)
+        finally:
+            _fetch_context.site = None
+            _fetch_context.deadline = None
+
+    def details(self, url):
+        cached = self.state.cached_document(url)
+        if cached is not None:
+            return cached
+        with timed('enrich', url=url) as fields:
+            document = fetch_document(url)
+            if document is None:
+                return {}
+            body, content_type = document
+            digest = hashlib.sha256(body).hexdigest()
+            details = self.state.document_details(digest)
+            if details is None:
+                details = extract_tender_details(document_text(body, content_type))
+            fields['details'] = len(details)
+        self.state.store_document(url, digest, details)
+        return details
+
+    def close(self):
+        """Waits for the tenders still being enriched, until DEADLINE_GRACE_SECONDS past the run deadline."""
+        with self.lock:
+            futures = {future: url for url, future in self.futures.items()}
+        timeout = self.deadline.remaining() + DEADLINE_GRACE_SECONDS if self.deadline else None
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Could not enrich the tender at {futures[future]}: {e}")
+        except FuturesTimeoutError:
+            print("Still enriching tenders at the run deadline; the rest are sent without details.")
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
 
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=4)
-        print("Tenders saved successfully.")
-    except IOError as e:
-        print(f"Error saving seen tenders to file '{filename}': {e}")
+# --- File and Email Handling ---
 
-def send_email(subject, body, recipients):
-    """Sends an email to a list of recipients."""
-    if not all([SENDER_EMAIL, APP_PASSWORD]) or not recipients:
-        print("Sender credentials or recipient list are not set. Skipping email notification.")
+def connect_tender_db(filename):
+    """Opens the tender store, creating its tables and indexes if needed."""
+    conn = sqlite3.connect(filename)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS sites (
+            name TEXT PRIMARY KEY,
+            position INTEGER NOT NULL,
+            last_full_crawl TEXT
+        );
+        CREATE TABLE IF NOT EXISTS tenders (
+            site TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            url TEXT,
+            tender_key INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS site_health (
+            name TEXT PRIMARY KEY,
+            consecutive_failures INTEGER NOT NULL DEFAULT 0,
+            circuit_opened_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS documents (
+            url TEXT PRIMARY KEY,
+            sha256 TEXT NOT NULL,
+            details TEXT NOT NULL,
+            fetched TEXT
+        );
+        CREATE INDEX IF NOT EXISTS documents_by_hash ON documents (sha256);
+    """)
+    # Columns added after the store was first introduced
+    for table, column, column_type in (
+        ('tenders', 'tender_key', 'INTEGER'),
+        ('sites', 'last_full_crawl', 'TEXT'),
+        ('tenders', 'first_seen', 'TEXT'),
+        ('tenders', 'last_seen', 'TEXT'),
+        ('tenders', 'missed_runs', 'INTEGER NOT NULL DEFAULT 0'),
+        ('sites', 'listing_fingerprint', 'TEXT'),
+    ):
+        if column not in {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+    conn.execute("DROP INDEX IF EXISTS tenders_by_site_title")
+    conn.execute("CREATE INDEX IF NOT EXISTS tenders_by_site_key ON tenders (site, tender_key)")
+    return conn
+
+def _replace_site_tenders(conn, website_name, tenders, keys=None, seen=None):
+    # Sites keep the position they were first stored at, so exports list them
+    # in the same order the JSON file always had.
+    conn.execute(
+        "INSERT OR IGNORE INTO sites (name, position) VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM sites))",
+        (website_name,)
+    )
+    conn.execute("DELETE FROM tenders WHERE site = ?", (website_name,))
+    keys = keys or [None] * len(tenders)
+    seen = seen or [{}] * len(tenders)
+    conn.executemany(
+        "INSERT INTO tenders (site, position, title, url, tender_key, first_seen, last_seen, missed_runs) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (website_name, position, t['title'], t.get('url'), key,
+             s.get('first_seen'), s.get('last_seen'), s.get('missed_runs', 0))
+            for position, (t, key, s) in enumerate(zip(tenders, keys, seen))
+        ]
+    )
+
+def migrate_tenders_json(json_file, db_file):
+    """Seeds an empty tender store from the JSON tender file, seen records included."""
+    if not os.path.exists(json_file) or os.stat(json_file).st_size == 0:
         return
     try:
-        msg = MIMEMultipart()
-        msg["Subject"] = subject
-        msg["From"] = SENDER_EMAIL
-        msg["To"] = ", ".join(recipients)  # Join list for the 'To' header
-        msg.attach(MIMEText(body, "plain"))
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
+        conn = connect_tender_db(db_file)
+        try:
+            with conn:
+                if conn.execute("SELECT COUNT(*) FROM sites").fetchone()[0]:
+                    return
+                with open(json_file, "r") as f:
+                    data = json.load(f)
+                for website_name, tenders in data.items():
+                    _replace_site_tenders(conn, website_name, tenders, seen=tenders)
+            print(f"Imported {len(data)} sites from '{json_file}' into '{db_file}'.")
+        finally:
+            conn.close()
+    except (IOError, json.JSONDecodeError, sqlite3.Error) as e:
+        print(f"Error importing tenders from '{json_file}' into '{db_file}': {e}")
+
+class TenderState:
+    """
+    The tender store for the duration of one run. Everything is read once by
+    load(); per-site updates are held in memory and written by commit() in a
+    single transaction, and export_json() replaces the JSON file atomically.
+    A cancelled or crashed run therefore leaves both files as they were.
+
+    Updates are merged into what is stored (see merge()): every tender
+    carries when it was first and last seen and how many full crawls in a
+    row have missed it, and is only dropped after TENDER_RETENTION_RUNS.
+
+    The store also keeps each site's circuit breaker: how many runs in a row
+    it has failed and when its circuit was opened (see circuit_open()), and
+    the details found in tender documents (see TenderEnricher).
+    """
+
+    def __init__(self, db_file=TENDERS_DB_FILE, websites=WEBSITES):
+        self.db_file = db_file
+        self.websites = {website['name']: website for website in websites}
+        self.tenders = {}
+        self.keys = {}
+        self.seen = {}
+        self.last_full_crawl = {}
+        self.fingerprints = {}
+        self.fingerprint_updates = {}
+        self.updates = {}
+        self.full_crawls = set()
+        self.unchanged = set()
+        self.failures = {}
+        self.circuit_opened_at = {}
+        self.health_updates = set()
+        self.documents = {}
+        self.document_hashes = {}
+        self.document_updates = {}
+        self.documents_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, db_file=TENDERS_DB_FILE, websites=WEBSITES):
+        """Reads every site's stored tenders from the store and builds their key sets."""
+        state = cls(db_file, websites)
+        try:
+            conn = connect_tender_db(db_file)
+            try:
+                sites = conn.execute("SELECT name, last_full_crawl, listing_fingerprint FROM sites ORDER BY position").fetchall()
+                for website_name, last_full_crawl, fingerprint in sites:
+                    state.tenders[website_name] = []
+                    state.keys[website_name] = set()
+                    state.seen[website_name] = {}
+                    if last_full_crawl:
+                        state.last_full_crawl[website_name] = datetime.fromisoformat(last_full_crawl)
+                    if fingerprint:
+                        state.fingerprints[website_name] = fingerprint
+                rows = conn.execute(
+                    "SELECT site, title, url, tender_key, first_seen, last_seen, missed_runs FROM tenders ORDER BY site, position"
+                )
+                for website_name, title, url, key, first_seen, last_seen, missed_runs in rows:
+                    tender = {'title': title, 'url': url}
+                    state.tenders[website_name].append(tender)
+                    # Rows imported from the JSON file have no key yet.
+                    key = key if key is not None else state.key(website_name, tender)
+                    state.keys[website_name].add(key)
+                    state.seen[website_name].setdefault(key, {
+                        'first_seen': first_seen, 'last_seen': last_seen, 'missed_runs': missed_runs or 0
+                    })
+                for website_name, failures, opened_at in conn.execute("SELECT name, consecutive_failures, circuit_opened_at FROM site_health"):
+                    state.failures[website_name] = failures
+                    if opened_at:
+                        state.circuit_opened_at[website_name] = datetime.fromisoformat(opened_at)
+                for url, digest, details in conn.execute("SELECT url, sha256, details FROM documents"):
+                    state.documents[url] = state.document_hashes[digest] = json.loads(details)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error loading seen tenders from '{db_file}': {e}")
+        return state
+
+    def key(self, website_name, tender):
+        """Returns the identity key of a tender on the given website."""
+        return tender_key(self.websites.get(website_name, {'name': website_name}), tender)
+
+    def cached_document(self, url):
+        """Returns the details found in the document at `url` by an earlier enrichment, or None."""
+        with self.documents_lock:
+            return self.documents.get(canonical_url(url))
+
+    def document_details(self, digest):
+        """Returns the details found in a document with this SHA-256 at any URL, or None."""
+        with self.documents_lock:
+            return self.document_hashes.get(digest)
+
+    def store_document(self, url, digest, details):
+        """Remembers the details found in a document. Written by commit()."""
+        with self.documents_lock:
+            self.documents[canonical_url(url)] = self.document_hashes[digest] = details
+            self.document_updates[canonical_url(url)] = (digest, details)
+
+    def has_tenders(self, website_name):
+        """Returns True if any tenders are stored for a website."""
+        return bool(self.tenders.get(website_name))
+
+    def full_crawl_due(self, website_name, interval_hours=FULL_CRAWL_INTERVAL_HOURS):
+        """Returns True if the website hasn't been crawled in full within the interval."""
+        last = self.last_full_crawl.get(website_name)
+        return last is None or datetime.now(timezone.utc) - last >= timedelta(hours=interval_hours)
+
+    def circuit_open(self, website_name, cooldown_hours=CIRCUIT_COOLDOWN_HOURS):
+        """
+        Returns True if the website should be skipped this run: its circuit
+        was opened after repeated failures and the cooldown hasn't passed.
+        Once it has, the circuit is half-open and the site is probed again.
+        """
+        opened_at = self.circuit_opened_at.get(website_name)
+        if opened_at is None:
+            return False
+        if datetime.now(timezone.utc) - opened_at < timedelta(hours=cooldown_hours):
+            return True
+        print(f"{website_name}: cooldown over, probing the site again.")
+        return False
+
+    def record_outcome(self, website_name, succeeded, threshold=CIRCUIT_FAILURE_THRESHOLD):
+        """
+        Counts a successful or failed scrape of the website, opening its
+        circuit after `threshold` failed runs in a row (or when a probe after
+        the cooldown fails) and closing it on success. Written by commit().
+        """
+        if succeeded:
+            self.failures[website_name] = 0
+            self.circuit_opened_at.pop(website_name, None)
+        else:
+            self.failures[website_name] = self.failures.get(website_name, 0) + 1
+            if self.failures[website_name] >= threshold:
+                print(f"{website_name}: failed {self.failures[website_name]} runs in a row, skipping it for {CIRCUIT_COOLDOWN_HOURS:g} hours.")
+                self.circuit_opened_at[website_name] = datetime.now(timezone.utc)
+        self.health_updates.add(website_name)
+
+    def merge(self, website_name, tenders, full_crawl, now, retention_runs=TENDER_RETENTION_RUNS):
+        """
+        Merges a scrape of a website into its stored tenders. Returns the
+        tenders to store (the scraped ones first, in listing order, then the
+        stored ones that weren't scraped), their keys and their seen records.
+        Stored tenders missing from a full crawl have their missed-run count
+        raised and are expired once it reaches `retention_runs`.
+        """
+        previous = self.seen.get(website_name, {})
+        merged, keys, seen = [], [], {}
+        for tender in tenders:
+            key = self.key(website_name, tender)
+            if key not in seen:
+                seen[key] = {
+                    'first_seen': previous.get(key, {}).get('first_seen') or now,
+                    'last_seen': now,
+                    'missed_runs': 0,
+                }
+            merged.append(tender)
+            keys.append(key)
+        expired = 0
+        for tender in self.tenders.get(website_name, []):
+            key = self.key(website_name, tender)
+            if key in seen:
+                continue
+            record = dict(previous.get(key) or {'first_seen': None, 'last_seen': None, 'missed_runs': 0})
+            if full_crawl:
+                record['missed_runs'] += 1
+            seen[key] = record
+            if record['missed_runs'] >= retention_runs:
+                expired += 1
+                continue
+            merged.append(tender)
+            keys.append(key)
+        if expired:
+            print(f"{website_name}: {expired} tender(s) expired after {retention_runs} full crawls without being seen.")
+        return merged, keys, [seen[key] for key in keys]
+
+    def update(self, website_name, tenders, full_crawl=True):
+        """
+        Records a scrape of a website, to be merged into the store by commit().
+        `full_crawl` marks it as a full crawl: only those count tenders that
+        are missing from the list as unseen, and they restart the interval
+        until the next full crawl.
+        """
+        self.updates[website_name] = tenders
+        if full_crawl:
+            self.full_crawls.add(website_name)
+
+    def mark_unchanged(self, website_name):
+        """Records that a website's listing is unchanged, so its current tenders count as seen this run."""
+        self.unchanged.add(website_name)
+
+    def set_fingerprint(self, website_name, fingerprint):
+        """Records the fingerprint of a website's stored listing (see check_listing_fingerprint). Written by commit()."""
+        if fingerprint and fingerprint != self.fingerprints.get(website_name):
+            self.fingerprint_updates[website_name] = fingerprint
+
+    def commit(self):
+        """Merges all recorded updates into the store in one transaction."""
+        if not (self.updates or self.health_updates or self.unchanged or self.document_updates or self.fingerprint_updates):
+            return
+        now = datetime.now(timezone.utc)
+        seen_at = now.isoformat(timespec='seconds')
+        merged = {
+            website_name: self.merge(website_name, tenders, website_name in self.full_crawls, seen_at)
+            for website_name, tenders in self.updates.items()
+        }
+        try:
+            conn = connect_tender_db(self.db_file)
+            try:
+                with conn:
+                    for website_name, (tenders, keys, seen) in merged.items():
+                        _replace_site_tenders(conn, website_name, tenders, keys, seen)
+                    conn.executemany(
+                        "UPDATE tenders SET last_seen = ? WHERE site = ? AND missed_runs = 0",
+                        [(seen_at, website_name) for website_name in self.unchanged]
+                    )
+                    conn.executemany(
+                        "UPDATE sites SET last_full_crawl = ? WHERE name = ?",
+                        [(now.isoformat(timespec='seconds'), website_name) for website_name in self.full_crawls]
+                    )
+                    conn.executemany(
+                        "UPDATE sites SET listing_fingerprint = ? WHERE name = ?",
+                        [(fingerprint, website_name) for website_name, fingerprint in self.fingerprint_updates.items()]
+                    )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO site_health (name, consecutive_failures, circuit_opened_at) VALUES (?, ?, ?)",
+                        [
+                            (website_name, self.failures.get(website_name, 0),
+                             self.circuit_opened_at[website_name].isoformat(timespec='seconds') if website_name in self.circuit_opened_at else None)
+                            for website_name in self.health_updates
+                        ]
+                    )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO documents (url, sha256, details, fetched) VALUES (?, ?, ?, ?)",
+                        [(url, digest, json.dumps(details), seen_at) for url, (digest, details) in self.document_updates.items()]
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error saving seen tenders to '{self.db_file}': {e}")
+            return
+        for website_name, (tenders, keys, seen) in merged.items():
+            self.tenders[website_name] = tenders
+            self.keys[website_name] = set(keys)
+            self.seen[website_name] = dict(zip(keys, seen))
+        for website_name in self.unchanged:
+            for record in self.seen.get(website_name, {}).values():
+                if record['missed_runs'] == 0:
+                    record['last_seen'] = seen_at
+        self.last_full_crawl.update({website_name: now for website_name in self.full_crawls})
+        self.fingerprints.update(self.fingerprint_updates)
+        self.fingerprint_updates = {}
+        self.full_crawls = set()
+        self.unchanged = set()
+        self.health_updates = set()
+        with self.documents_lock:
+            self.document_updates = {}
+        if self.updates:
+            print(f"Tenders saved successfully for {len(self.updates)} site(s).")
+        self.updates = {}
+
+    def export_json(self, json_file):
+        """
+        Writes the committed tenders to the JSON tender file via a temporary
+        file and rename. Each tender carries when it was first seen and, once
+        a full crawl has missed it, its missed-run count, so a store seeded
+        from the file (see migrate_tenders_json) keeps expiring them. The
+        file is tracked in git, so last_seen, which changes every run, is
+        left to the store.
+        """
+        exported = {
+            website_name: [self._export_tender(website_name, tender) for tender in tenders]
+            for website_name, tenders in self.tenders.items()
+        }
+        temp_file = f"{json_file}.tmp"
+        try:
+            with open(temp_file, "w") as f:
+                json.dump(exported, f, indent=4)
+            os.replace(temp_file, json_file)
+            print(f"Exported tenders to '{json_file}'.")
+        except IOError as e:
+            print(f"Error exporting tenders to '{json_file}': {e}")
+
+    def _export_tender(self, website_name, tender):
+        record = self.seen.get(website_name, {}).get(self.key(website_name, tender), {})
+        exported = dict(tender)
+        if record.get('first_seen'):
+            exported['first_seen'] = record['first_seen']
+        if record.get('missed_runs'):
+            exported['missed_runs'] = record['missed_runs']
+        return exported
+
+class IncrementalCrawl:
+    """
+    Pagination stop callback for a site crawled incrementally. Called with
+    each page's tenders, it answers True once `threshold` consecutive tenders
+    are already in the store; `stopped` then records that the result only
+    covers the newest part of the listing.
+    """
+
+    def __init__(self, state, website_name, threshold=INCREMENTAL_STOP_AFTER):
+        self.state = state
+        self.website_name = website_name
+        self.threshold = threshold
+        self.consecutive_seen = 0
+        self.stopped = False
+
+    def __call__(self, page_tenders):
+        seen = self.state.keys.get(self.website_name, set())
+        for tender in page_tenders:
+            if self.state.key(self.website_name, tender) in seen:
+                self.consecutive_seen += 1
+            else:
+                self.consecutive_seen = 0
+        if self.consecutive_seen >= self.threshold:
+            print(f"{self.website_name}: {self.consecutive_seen} known tenders in a row, stopping pagination.")
+            self.stopped = True
+        return self.stopped
+
+class TenderDiff:
+    """
+    Streaming diff of one site's scrape against its stored keys. Called from
+    the scraper's thread with each tender as it is scraped, so new tenders
+    reach the notification sink (each once), and the enricher, before
+    pagination has finished.
+    """
+
+    def __init__(self, state, website_name, sink, enricher=None):
+        self.state = state
+        self.website_name = website_name
+        self.sink = sink
+        self.enricher = enricher
+        self.seen = set(state.keys.get(website_name, ()))
+        self.seconds = 0.0
+
+    def __call__(self, tender):
+        started = time.perf_counter()
+        key = self.state.key(self.website_name, tender)
+        if key not in self.seen:
+            self.seen.add(key)
+            self.sink.add(self.website_name, tender)
+            if self.enricher:
+                self.enricher.submit(self.website_name, tender)
+        self.seconds += time.perf_counter() - started
+
+TENDER_DETAIL_LABELS = {'closing_date': "Closing date", 'value': "Value", 'emd': "EMD", 'reference': "Reference"}
+
+class NotificationSink:
+    """
+    Builds the alert email as new tenders stream in. Scraper threads add to
+    their site's section in any order, and render() writes the sections
+    once, in WEBSITES order, so the email stays deterministic and includes
+    the details enrichment found in the meantime. A section without new
+    tenders shows its status line instead.
+    """
+
+    def __init__(self, website_names):
+        self.lock = threading.Lock()
+        self.sections = {
+            name: {'notes': [], 'tenders': [], 'status': "No new tenders found."}
+            for name in website_names
+        }
+
+    def add(self, website_name, tender):
+        with self.lock:
+            self.sections[website_name]['tenders'].append(tender)
+
+    def note(self, website_name, text):
+        """Adds a line shown at the top of the site's section."""
+        with self.lock:
+            self.sections[website_name]['notes'].append(f"{text}\n")
+
+    def set_status(self, website_name, text):
+        """Drops the site's new tenders (its results aren't usable) and shows `text` instead."""
+        with self.lock:
+            section = self.sections[website_name]
+            section['tenders'], section['status'] = [], text
+
+    def new_count(self):
+        with self.lock:
+            return sum(len(section['tenders']) for section in self.sections.values())
+
+    def render(self, details=None):
+        """Writes the email; `details` maps canonical tender URLs to their enrichment (see TenderEnricher.found)."""
+        details = details or {}
+        with self.lock:
+            parts = ["Hello,\n\nHere is a summary of new tenders:\n\n"]
+            for name, section in self.sections.items():
+                parts.append(f"--- {name} ---\n")
+                parts.extend(section['notes'])
+                if section['tenders']:
+                    parts.append(f"Found {len(section['tenders'])} new tender(s):\n")
+                    for tender in section['tenders']:
+                        parts.append(f"- Title: {tender['title']}\n  URL: {tender['url']}\n")
+                        found = details.get(canonical_url(tender['url'])) or {}
+                        labelled = [f"{label}: {found[field]}" for field, label in TENDER_DETAIL_LABELS.items() if found.get(field)]
+                        if labelled:
+                            parts.append(f"  {' | '.join(labelled)}\n")
+                    parts.append("\n")
+                else:
+                    parts.append(f"{section['status']}\n\n")
+            return "".join(parts)
+
+def _write_outbox_message(path, message):
+    """Writes a queued message through a temporary file, so a crash never leaves half of one."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(message, f, indent=4)
+    os.replace(temp_path, path)
+
+def queue_email(subject, body, recipients, outbox_dir=OUTBOX_DIR):
+    """Adds an email to the outbox; deliver_outbox() sends it. Returns its file, or None if not queued."""
+    if not recipients:
+        print("Recipient list is not set. Skipping email notification.")
+        return None
+    from email.utils import make_msgid
+
+    os.makedirs(outbox_dir, exist_ok=True)
+    message = {
+        # Kept across retries, so a message the server accepted but didn't
+        # confirm (and is sent again) can be recognised as a duplicate.
+        'message_id': make_msgid(domain="tender-notifier"),
+        'created': datetime.now(timezone.utc).isoformat(),
+        'subject': subject,
+        'body': body,
+        'recipients': recipients,
+        'attempts': 0,
+        'last_error': None,
+    }
+    # Names sort in queueing order
+    path = os.path.join(outbox_dir, f"{time.time_ns()}-{uuid.uuid4().hex[:8]}.json")
+    _write_outbox_message(path, message)
+    return path
+
+def build_email(message):
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.utils import formatdate
+
+    msg = MIMEMultipart()
+    msg["Subject"] = message['subject']
+    msg["From"] = SENDER_EMAIL
+    msg["To"] = ", ".join(message['recipients'])  # Join list for the 'To' header
+    msg["Date"] = formatdate(localtime=True)
+    msg["Message-ID"] = message['message_id']
+    msg.attach(MIMEText(message['body'], "plain"))
+    return msg
+
+def connect_smtp():
+    """Opens a connection to the outgoing mail server (see SMTP_HOST), logged in if there is a password."""
+    import smtplib
+
+    if SMTP_SSL:
+        server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+    else:
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+        server.ehlo()
+        if server.has_extn("starttls"):
+            server.starttls()
+            server.ehlo()
+    try:
+        if APP_PASSWORD:
             server.login(SENDER_EMAIL, APP_PASSWORD)
-            # sendmail can handle a list of recipients directly
-            server.sendmail(SENDER_EMAIL, recipients, msg.as_string())
-        print(f"Email alert sent successfully to: {', '.join(recipients)}")
-    except Exception as e:
-        print(f"Error sending email: {e}")
+    except Exception:
+        server.close()
+        raise
+    return server
+
+def _record_failed_delivery(outbox_dir, name, message, error, max_attempts):
+    message['attempts'] += 1
+    message['last_error'] = str(error)
+    path = os.path.join(outbox_dir, name)
+    if message['attempts'] < max_attempts:
+        _write_outbox_message(path, message)
+        return
+    failed_dir = os.path.join(outbox_dir, "failed")
+    os.makedirs(failed_dir, exist_ok=True)
+    _write_outbox_message(os.path.join(failed_dir, name), message)
+    os.remove(path)
+    print(f"Giving up on '{message['subject']}' after {message['attempts']} attempts; moved to '{failed_dir}'.")
+
+def deliver_outbox(outbox_dir=OUTBOX_DIR, batch_size=OUTBOX_BATCH_SIZE, max_attempts=OUTBOX_MAX_ATTEMPTS):
+    """
+    Sends the queued emails, oldest first, reusing one SMTP connection for
+    each batch of `batch_size`. A message the server rejects is kept for the
+    next run; losing the connection stops delivery with the rest still
+    queued. Returns the number of emails sent.
+    """
+    if not os.path.isdir(outbox_dir):
+        return 0
+    pending = sorted(name for name in os.listdir(outbox_dir) if name.endswith(".json"))
+    if not pending:
+        return 0
+    if not SENDER_EMAIL:
+        print(f"Sender email is not set. Leaving {len(pending)} email(s) in '{outbox_dir}'.")
+        return 0
+    with timed_import("smtplib, email (lazy)"):
+        import smtplib
+
+    sent = 0
+    for start in range(0, len(pending), batch_size):
+        try:
+            server = connect_smtp()
+        except OSError as e:  # smtplib errors included
+            print(f"Could not connect to {SMTP_HOST}:{SMTP_PORT}: {e}. {len(pending) - start} email(s) stay queued.")
+            return sent
+        try:
+            for name in pending[start:start + batch_size]:
+                path = os.path.join(outbox_dir, name)
+                with open(path, "r") as f:
+                    message = json.load(f)
+                try:
+                    refused = server.sendmail(SENDER_EMAIL, message['recipients'], build_email(message).as_string())
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as e:
+                    if getattr(e, 'smtp_code', None) == 421:
+                        raise  # The server is closing the connection
+                    print(f"The server rejected '{message['subject']}': {e}")
+                    _record_failed_delivery(outbox_dir, name, message, e, max_attempts)
+                    continue
+                except OSError as e:
+                    _record_failed_delivery(outbox_dir, name, message, e, max_attempts)
+                    raise
+                os.remove(path)
+                sent += 1
+                if refused:
+                    print(f"'{message['subject']}' was not accepted for: {', '.join(refused)}")
+                print(f"Email alert sent successfully to: {', '.join(message['recipients'])}")
+        except OSError as e:
+            print(f"Lost the connection to {SMTP_HOST}:{SMTP_PORT}: {e}. The remaining emails stay queued.")
+            return sent
+        finally:
+            try:
+                server.quit()
+            except OSError:
+                server.close()
+    return sent
 
 # --- Main Logic ---
 
-def get_all_tenders_for_website(website):
-    """Helper function to call the correct scraper based on website type."""
-    # Special case for websites that need their own tailored function
-    if website['name'] == "GTAI":
-        return get_gtai_tenders(website['url'])
-    if website['name'] == "ADB":
-        return get_adb_tenders(website['url'])
-
-    if website['dynamic']:
-        # Use the unified Selenium scraper for dynamic sites
-        return get_dynamic_tenders(
-            website['url'],
-            website['wait_selector'],
-            website['title_selector'],
-            website['link_selector']
-        )
+# Sites whose "fetch" is "custom": scrapers that do more than the extract
+# spec can describe (clicking through pages, expanding document lists).
+CUSTOM_SCRAPERS = {
+    "TGREDCO": get_tgredco_tenders,
+    "GTAI": get_gtai_tenders,
+    "ADB": get_adb_tenders,
+}
+
+def iter_tenders_for_website(website, stop=None):
+    """
+    Runs a website's scraper according to its "fetch" mode and yields its
+    tenders as they are scraped. `stop` is passed on to the paginated
+    scrapers (see IncrementalCrawl).
+    """
+    # Dynamic sites with a recorded API are fetched without a browser
+    api = SITE_API_ENDPOINTS.get(website['name']) if website['dynamic'] else None
+    if api:
+        tenders = get_api_tenders(website, api, stop)
+        if tenders is not None:
+            yield from tenders
+            return
+        print(f"Falling back to the browser for {website['name']}.")
+
+    fetch = website.get('fetch', 'browser' if website['dynamic'] else 'static')
+    if fetch == 'custom':
+        yield from CUSTOM_SCRAPERS[website['name']](website['url'], stop)
+    elif fetch == 'browser':
+        yield from get_browser_tenders(website)
     else:
-        # Use the specific BeautifulSoup scraper for static sites
-        if website['name'] == "GIZ":
-            return get_giz_tenders(website['url'])
-        elif website['name'] == "GEDA":
-            return get_geda_tenders(website['url'])
-        elif website['name'] == "MAHAURJA":
-            return get_mahaurja_tenders(website['url'])
-        elif website['name'] == "HPPCL":
-            return get_hppcl_tenders(website['url'])
-        elif website['name'] == "HAREDA":
-            return get_hareda_tenders(website['url'])
-        elif website['name'] == "BREDA":
-            return get_breda_tenders(website['url'])
-        elif website['name'] == "TGREDCO":
-            return get_tgredco_tenders(website['url'])
-        elif website['name'] == "SECI":
-            return get_seci_tenders(website['url'])
-        elif website['name'] == "NIWE":
-            return get_niwe_tenders(website['url'])
-        elif website['name'] == "IREDA":
-            return get_ireda_tenders(website['url'])
-        elif website['name'] == "MAHAPREIT":
-            return get_mahapreit_tenders(website['url'])
-        elif website['name'] == "NISE":
-            return get_nise_tenders(website['url'])
-    return []
-
-def main():
-    """Main function to check for new tenders across all websites."""
-    all_new_tenders_found = False
-    email_body = "Hello,\n\nHere is a summary of new tenders:\n\n"
+        yield from iter_static_tenders(website, stop)
+
+def get_all_tenders_for_website(website, stop=None):
+    """Returns all tenders of a website as a list (see iter_tenders_for_website)."""
+    return list(iter_tenders_for_website(website, stop))
+
+def cancel_site(website_name, deadline):
+    """Watchdog for a site that has run out of time: marks its deadline and quits its browsers."""
+    deadline.exceeded = True
+    print(f"{website_name}: time budget exhausted, cancelling its scraper.")
+    BROWSER_POOL.cancel(website_name)
+
+def scrape_website(website, allow_not_modified=False, stop=None, deadline=None, on_tender=None, fingerprints=None,
+                   incomplete=None):
+    """
+    Runs the scraper for a website and returns its tenders, passing each to
+    `on_tender` as soon as it is scraped. With `allow_not_modified`, returns
+    None instead of re-parsing when the site's listing page is unchanged
+    since the last run, so the caller can keep the stored tenders as they are.
+    With a `deadline`, the scraper is cut off once it passes; check
+    `deadline.exceeded` to tell whether the tenders returned are partial.
+
+    `fingerprints` maps site names to their stored listing fingerprint; an
+    unchanged listing also counts as not modified, and the site's new
+    fingerprint is put back into it. The site is added to the `incomplete`
+    set, if given, when its crawl stopped on an error (see
+    mark_crawl_incomplete()).
+    """
+    fingerprints = fingerprints if fingerprints is not None else {}
+    _fetch_context.short_circuit = allow_not_modified
+    _fetch_context.listing = {
+        'previous': fingerprints.get(website['name']) if allow_not_modified else None,
+        'current': None,
+    }
+    _fetch_context.site = website['name']
+    _fetch_context.retry_budget = RetryBudget(website.get('retry_budget', SITE_RETRY_BUDGET))
+    _fetch_context.deadline = deadline
+    _fetch_context.incomplete = False
+    watchdog = None
+    if deadline:
+        watchdog = threading.Timer(deadline.remaining(), cancel_site, args=(website['name'], deadline))
+        watchdog.daemon = True
+        watchdog.start()
+    try:
+        with timed('scrape') as fields, profiled(website['name']):
+            tenders = []
+            stream = iter_tenders_for_website(website, stop)
+            try:
+                for tender in stream:
+                    tenders.append(tender)
+                    if on_tender:
+                        on_tender(tender)
+            except PageNotModified:
+                fields['not_modified'] = True
+                print(f"{website['name']}: listing page unchanged since the last run.")
+                return None
+            except BudgetExceeded as e:
+                print(f"{website['name']}: {e}.")
+            finally:
+                # Releases a browser held by a scraper that didn't finish
+                stream.close()
+            fields['tenders'] = len(tenders)
+            if deadline and deadline.exceeded:
+                fields['partial'] = True
+                print(f"{website['name']}: ran out of time, keeping the {len(tenders)} tender(s) found so far.")
+            elif _fetch_context.incomplete and tenders:
+                fields['incomplete'] = True
+                if incomplete is not None:
+                    incomplete.add(website['name'])
+                print(f"{website['name']}: crawl stopped on an error, keeping the {len(tenders)} tender(s) found so far.")
+            return tenders
+    finally:
+        if watchdog:
+            watchdog.cancel()
+        if _fetch_context.listing['current']:
+            fingerprints[website['name']] = _fetch_context.listing['current']
+        _fetch_context.listing = None
+        _fetch_context.short_circuit = False
+        _fetch_context.site = None
+        _fetch_context.retry_budget = None
+        _fetch_context.deadline = None
+        _fetch_context.incomplete = False
+
+def scrape_websites_concurrently(websites, max_workers=MAX_WORKERS, per_host_limit=MAX_REQUESTS_PER_HOST,
+                                 max_browsers=BROWSER_POOL_SIZE, not_modified_ok=(), stops=None,
+                                 deadline=None, partial=None, consumers=None, fingerprints=None, incomplete=None):
+    """
+    Scrapes the given websites in parallel and returns their tenders keyed by
+    website name. At most `per_host_limit` sites sharing a host run at once.
+    Dynamic sites get their own pool of `max_browsers` workers so that their
+    Selenium waits overlap with the static scrapers without starving them.
+    Sites named in `not_modified_ok` map to None when their listing page is
+    unchanged (see scrape_website). `stops` maps site names to the
+    pagination stop callback to use for them, and `consumers` to a callback
+    receiving each of their tenders as it is scraped. `fingerprints` holds
+    the sites' listing fingerprints and receives the new ones (see
+    scrape_website).
+
+    With a run `deadline`, each site gets its time budget (but no more than
+    the run has left), sites not started by the deadline are left out of the
+    result, and sites still running DEADLINE_GRACE_SECONDS after it are
+    abandoned. Sites cut short are added to the `partial` set, if given,
+    and sites whose crawl stopped on an error to the `incomplete` set.
+    """
+    stops = stops or {}
+    consumers = consumers or {}
+    partial = partial if partial is not None else set()
+
+    def run(website):
+        site_deadline = None
+        if deadline:
+            deadline.check("Run deadline")
+            site_deadline = Deadline(min(website.get('time_budget', SITE_TIME_BUDGET_SECONDS), deadline.remaining()))
+        tenders = scrape_website(website, website['name'] in not_modified_ok, stops.get(website['name']),
+                                 site_deadline, consumers.get(website['name']), fingerprints, incomplete)
+        if site_deadline and site_deadline.exceeded:
+            partial.add(website['name'])
+        return tenders
+
+    results = {}
+    if max_workers <= 1:
+        for website in websites:
+            try:
+                results[website['name']] = run(website)
+            except BudgetExceeded:
+                print(f"{website['name']}: not started before the run deadline.")
+            except Exception as e:
+                print(f"An error occurred while scraping {website['name']}: {e}")
+                results[website['name']] = []
+        return results
+
+    host_semaphores = {}
+    for website in websites:
+        host = urlparse(website['url']).netloc.lower()
+        if host not in host_semaphores:
+            host_semaphores[host] = threading.BoundedSemaphore(per_host_limit)
+
+    def scrape(website):
+        with host_semaphores[urlparse(website['url']).netloc.lower()]:
+            return run(website)
+
+    static_executor = ThreadPoolExecutor(max_workers=max_workers)
+    dynamic_executor = ThreadPoolExecutor(max_workers=max(1, max_browsers))
+    timed_out = False
+    try:
+        futures = {}
+        for website in websites:
+            executor = dynamic_executor if website['dynamic'] else static_executor
+            futures[executor.submit(scrape, website)] = website['name']
+        timeout = deadline.remaining() + DEADLINE_GRACE_SECONDS if deadline else None
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except BudgetExceeded:
+                    print(f"{name}: not started before the run deadline.")
+                except Exception as e:
+                    print(f"An error occurred while scraping {name}: {e}")
+                    results[name] = []
+        except FuturesTimeoutError:
+            timed_out = True
+            for future, name in futures.items():
+                if not future.done():
+                    print(f"{name}: still running at the run deadline, abandoning it.")
+                    future.cancel()
+                    partial.add(name)
+                    BROWSER_POOL.cancel(name)
+    finally:
+        # Abandoned scrapers aren't waited for here. Their requests are capped
+        # by the site deadline and their browsers quit, so they wind down soon.
+        static_executor.shutdown(wait=not timed_out, cancel_futures=timed_out)
+        dynamic_executor.shutdown(wait=not timed_out, cancel_futures=timed_out)
+    return results
+
+def check_websites(websites, state, run_deadline, subject="Daily Tender Alert: New Tenders Found",
+                   max_workers=MAX_WORKERS, dry_run=False, send_alerts=True):
+    """
+    Scrapes the given websites, queues an alert for the new tenders, stores
+    them all, and sends the alert. The HTTP session and browsers are left open for
+    the caller to reuse or close.
+
+    A `dry_run` saves nothing from the run (store, JSON export, HTTP cache or
+    outbox) and prints the alert instead; without `send_alerts` the tenders
+    are stored but the alert is only printed.
+    """
+    # All sites are fetched in parallel up front. Each site's tenders are
+    # diffed as they stream in, and new ones go straight into the email,
+    # whose sections stay in WEBSITES order.
+    print(f"Scraping {len(websites)} websites with up to {max_workers} workers and {BROWSER_POOL_SIZE} browser(s)...")
+    sink = NotificationSink([website['name'] for website in websites])
+    enricher = TenderEnricher(state, deadline=run_deadline) if ENRICH_TENDERS else None
+    diffs = {website['name']: TenderDiff(state, website['name'], sink, enricher) for website in websites}
+    # Sites with stored tenders can skip parsing and diffing entirely when
+    # their listing page comes back 304 or byte-identical.
+    sites_with_history = {website['name'] for website in websites if state.has_tenders(website['name'])}
+    # Known sites are crawled incrementally between periodic full crawls.
+    incremental = {name: IncrementalCrawl(state, name) for name in sites_with_history if not state.full_crawl_due(name)}
+    # Sites that keep failing are left alone until their cooldown has passed.
+    skipped = {website['name'] for website in websites if state.circuit_open(website['name'])}
+    # Sites cut short by their time budget or the run deadline, and sites
+    # whose pagination stopped on an error
+    partial = set()
+    incomplete = set()
+    # A known site whose tender listing fingerprints the same as last run's
+    # is treated like an unchanged page, whatever else on it changed.
+    fingerprints = {name: state.fingerprints[name] for name in sites_with_history if name in state.fingerprints}
+    # Sites whose pages may answer "not modified" next run: only those whose
+    # tenders were stored in full. The others are fetched and parsed again.
+    cacheable = []
+    results = scrape_websites_concurrently(
+        [website for website in websites if website['name'] not in skipped], max_workers=max_workers,
+        not_modified_ok=sites_with_history, stops=incremental, deadline=run_deadline, partial=partial,
+        consumers=diffs, fingerprints=fingerprints, incomplete=incomplete
+    )
+
+    for website in websites:
+        if website['name'] in skipped:
+            sink.set_status(website['name'], f"Skipped: the site failed {state.failures[website['name']]} runs in a row and is resting.")
+            continue
+
+        if website['name'] not in results:
+            if website['name'] in partial:
+                # Still hung at the deadline; sites never started aren't at fault.
+                state.record_outcome(website['name'], False)
+            # Its tenders were never stored, so they'll be reported next run.
+            sink.set_status(website['name'], "Not checked: the run deadline was reached before the site finished.")
+            continue
 
-    for website in WEBSITES:
         print(f"Checking for new tenders on {website['name']}...")
-        all_tenders = get_all_tenders_for_website(website)
+        all_tenders = results[website['name']]
+        # An exception or an empty listing counts as a failed run.
+        state.record_outcome(website['name'], all_tenders is None or bool(all_tenders))
+
+        if all_tenders is None:
+            state.mark_unchanged(website['name'])
+            cacheable.append(website['name'])
+            continue
         
         if not all_tenders:
-            email_body += f"--- {website['name']} ---\n"
-            email_body += "No tenders were found on the website or an error occurred.\n\n"
+            sink.set_status(website['name'], "No tenders were found on the website or an error occurred.")
             continue
+
+        RUN_METRICS.record('diff', diffs[website['name']].seconds, website['name'], tenders=len(all_tenders))
+        cut_short = website['name'] in partial or website['name'] in incomplete
+        if website['name'] in partial:
+            sink.note(website['name'], "Partial results: the site ran out of time.")
+        elif website['name'] in incomplete:
+            sink.note(website['name'], "Partial results: a page of the listing could not be read.")
         
-        seen_tenders_titles = load_seen_tenders(TENDERS_DATA_FILE, website['name'])
-        
-        new_tenders = [t for t in all_tenders if t['title'] not in seen_tenders_titles]
-        
-        email_body += f"--- {website['name']} ---\n"
-        if new_tenders:
-            all_new_tenders_found = True
-            email_body += f"Found {len(new_tenders)} new tender(s):\n"
-            for tender in new_tenders:
-                email_body += f"- Title: {tender['title']}\n"
-                email_body += f"  URL: {tender['url']}\n"
-            email_body += "\n"
-        else:
-            email_body += "No new tenders found.\n\n"
-        
-        save_seen_tenders(all_tenders, TENDERS_DATA_FILE, website['name'])
+        crawl = incremental.get(website['name'])
+        # When only the newest pages were read, or the site ran out of time or
+        # failed partway, tenders missing from the list aren't counted as unseen.
+        state.update(website['name'], all_tenders, full_crawl=not ((crawl and crawl.stopped) or cut_short))
+        if not cut_short:
+            state.set_fingerprint(website['name'], fingerprints.get(website['name']))
+            cacheable.append(website['name'])
+
+    if enricher:
+        enricher.close()
+    # The alert is queued before the new tenders are stored as seen: if the
+    # run stops in between, or queueing fails, they are reported again next
+    # run rather than never.
+    if not sink.new_count():
+        print("No new tenders found across all websites.")
+    elif dry_run or not send_alerts:
+        print(sink.render(enricher.found if enricher else None))
+    else:
+        queue_email(subject, sink.render(enricher.found if enricher else None), RECEIVER_EMAILS)
+
+    if not dry_run:
+        with timed('store'):
+            state.commit()
+        if EXPORT_TENDERS_JSON:
+            with timed('export'):
+                state.export_json(TENDERS_DATA_FILE)
+        commit_http_cache(cacheable)
+        save_http_cache()
+    if send_alerts and not dry_run:
+        # Also retries alerts earlier runs failed to send
+        with timed('email'):
+            deliver_outbox()
+
+def load_tender_state(dry_run=False):
+    """
+    Seeds the tender store from the JSON tender file if it is empty, then
+    loads it. A dry run does both on a throwaway copy of the store, so that
+    neither file is written.
+    """
+    if not dry_run:
+        migrate_tenders_json(TENDERS_DATA_FILE, TENDERS_DB_FILE)
+        return TenderState.load(TENDERS_DB_FILE)
+    with tempfile.TemporaryDirectory() as scratch:
+        db_file = os.path.join(scratch, os.path.basename(TENDERS_DB_FILE))
+        if os.path.exists(TENDERS_DB_FILE):
+            shutil.copyfile(TENDERS_DB_FILE, db_file)
+        migrate_tenders_json(TENDERS_DATA_FILE, db_file)
+        return TenderState.load(db_file)
+
+def run_once(websites=WEBSITES, max_workers=MAX_WORKERS, dry_run=False, send_alerts=True, report_file=RUN_REPORT_FILE):
+    """Checks the given websites once for new tenders (see check_websites) and writes the run report."""
+    run_deadline = Deadline(RUN_DEADLINE_SECONDS)
+    with timed('load'):
+        state = load_tender_state(dry_run)
+
+    try:
+        check_websites(websites, state, run_deadline, max_workers=max_workers, dry_run=dry_run, send_alerts=send_alerts)
+    finally:
+        close_session()
+        BROWSER_POOL.close()
 
-    if all_new_tenders_found:
-        send_email(f"Daily Tender Alert: New Tenders Found", email_body, RECEIVER_EMAILS)
+    RUN_METRICS.print_summary()
+    if report_file:
+        RUN_METRICS.write_report(report_file)
+
+def poll_interval_seconds(website):
+    return website.get('poll_interval', POLL_INTERVAL_MINUTES) * 60
+
+def _stop_daemon(signum, frame):
+    raise KeyboardInterrupt
+
+def run_daemon(websites=WEBSITES, max_workers=MAX_WORKERS):
+    """
+    Checks each website every "poll_interval" minutes until interrupted
+    (Ctrl+C or SIGTERM). The sites wait in a heap ordered by when they are
+    next due; those due together are checked as one batch, and the run
+    report is rewritten after each.
+    """
+    global RUN_METRICS
+    signal.signal(signal.SIGTERM, _stop_daemon)
+    state = load_tender_state()
+    # (due time, position in WEBSITES, website): ties go to the earlier site
+    schedule = [(time.monotonic(), position, website) for position, website in enumerate(websites)]
+    heapq.heapify(schedule)
+    print(f"Polling {len(websites)} websites. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(max(0.0, schedule[0][0] - time.monotonic()))
+            batch = []
+            while schedule and schedule[0][0] <= time.monotonic() + POLL_BATCH_SECONDS:
+                batch.append(heapq.heappop(schedule))
+            batch.sort(key=lambda entry: entry[1])
+
+            RUN_METRICS = RunMetrics()
+            try:
+                check_websites([website for _, _, website in batch], state, Deadline(RUN_DEADLINE_SECONDS),
+                               subject="Tender Alert: New Tenders Found", max_workers=max_workers)
+            except Exception as e:
+                print(f"An error occurred while checking {', '.join(website['name'] for _, _, website in batch)}: {e}")
+            RUN_METRICS.print_summary()
+            if RUN_REPORT_FILE:
+                RUN_METRICS.write_report(RUN_REPORT_FILE)
+
+            # Due again one interval after the last due time, or after now if
+            # the check overran it, so a slow site doesn't pile up checks.
+            now = time.monotonic()
+            for due_at, position, website in batch:
+                heapq.heappush(schedule, (max(due_at + poll_interval_seconds(website), now), position, website))
+            due_at, _, website = schedule[0]
+            print(f"Next check: {website['name']} in {max(0.0, due_at - now) / 60:.0f} min.")
+    except KeyboardInterrupt:
+        print("Stopping the daemon.")
+    finally:
+        close_session()
+        BROWSER_POOL.close()
+
+def select_websites(names):
+    """Returns the WEBSITES entries named in a comma-separated list (all of them if None), in WEBSITES order."""
+    if names is None:
+        return list(WEBSITES)
+    wanted = {name.strip().casefold() for name in names.split(",") if name.strip()}
+    if not wanted:
+        raise ValueError(f"no sites given in --sites {names!r}")
+    unknown = wanted - {website['name'].casefold() for website in WEBSITES}
+    if unknown:
+        raise ValueError(f"unknown site(s): {', '.join(sorted(unknown))} "
+                         f"(choose from {', '.join(website['name'] for website in WEBSITES)})")
+    return [website for website in WEBSITES if website['name'].casefold() in wanted]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="scrape_tenders.py",
+        description="Checks tender websites for new tenders and emails an alert. Runs once by default."
+    )
+    parser.add_argument("--profile-imports", action="store_true", help="print how long imports took at exit")
+    parser.set_defaults(command="run", sites=None, jobs=MAX_WORKERS, dry_run=False, no_email=False, output=RUN_REPORT_FILE)
+    commands = parser.add_subparsers(dest="command")
+
+    def add_site_options(command):
+        command.add_argument("--sites", help="comma-separated sites to check (default: all)")
+        command.add_argument("--jobs", type=int, default=MAX_WORKERS,
+                             help=f"sites scraped at once (default: {MAX_WORKERS})")
+
+    run = commands.add_parser("run", help="check the websites once (the default)")
+    add_site_options(run)
+    run.add_argument("--dry-run", action="store_true",
+                     help="scrape and print the alert, but leave the tender files and HTTP cache as they are and send no email")
+    run.add_argument("--no-email", action="store_true", help="store the tenders but print the alert instead of emailing it")
+    run.add_argument("--output", default=RUN_REPORT_FILE,
+                     help="file the run report is written to, JSON or .csv (default: RUN_REPORT_FILE)")
+
+    daemon = commands.add_parser("daemon", help="stay up and check each site on its poll interval")
+    add_site_options(daemon)
+
+    discover = commands.add_parser("discover-api", help="record the JSON APIs behind dynamic sites")
+    discover.add_argument("site_names", nargs="*", metavar="SITE", help="dynamic sites to inspect")
+
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    try:
+        args.websites = select_websites(args.sites)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+def main(argv=None):
+    """Main function: runs the command given on the command line (see parse_args)."""
+    args = parse_args(argv)
+    if args.profile_imports:
+        atexit.register(print_import_report)
+    if args.command == "discover-api":
+        discover_api_endpoints(args.site_names)
+    elif args.command == "daemon":
+        run_daemon(args.websites, args.jobs)
     else:
-        print("No new tenders found across all websites.")
+        run_once(args.websites, args.jobs, dry_run=args.dry_run, send_alerts=not args.no_email, report_file=args.output)
+
+MODULE_LOAD_SECONDS = time.perf_counter() - _module_started
 
 if __name__ == "__main__":
     main()